@@ -0,0 +1,180 @@
+import argparse
+import glob
+import importlib
+import multiprocessing
+import time
+from pathlib import Path
+
+from tabulate import tabulate
+
+import lxi_file_read_funcs as lxrf
+
+importlib.reload(lxrf)
+
+
+def find_raw_files(path=None, pattern="*_LEXI_raw_*.txt"):
+    """
+    Finds the raw files to be processed.
+
+    Parameters
+    ----------
+    path : str
+        Either a directory, in which case all the files matching "pattern" in it are used, or a
+        glob pattern. Default is None.
+    pattern : str
+        Pattern of the raw files when "path" is a directory. Default is "*_LEXI_raw_*.txt".
+
+    Returns
+    -------
+    file_list : list
+        Sorted list of the absolute path of the raw files.
+    """
+    if Path(path).is_dir():
+        file_list = Path(path).glob(pattern)
+    else:
+        file_list = [Path(file_name) for file_name in glob.glob(path)]
+
+    # The output folders are worked out from the path of the raw file, so the path must be absolute
+    return sorted(file_name.resolve().as_posix() for file_name in file_list
+                  if file_name.is_file())
+
+
+def ingest_file(in_file_name=None, number_of_decimals=6, save_format="csv"):
+    """
+    Decodes one raw file and saves the processed science and housekeeping data, using
+    "lxi_file_read_funcs.read_binary_data".
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the raw file. Default is None.
+    number_of_decimals : int
+        Number of decimals to save. Default is 6.
+    save_format : str
+        Format of the processed files, one of "lxi_file_read_funcs.save_formats". Default is
+        "csv".
+
+    Returns
+    -------
+    file_details : dict
+        Name of the raw file, its size in MB, the number of science and housekeeping packets, the
+        time it took to process the file and the error message if it could not be processed.
+    """
+    file_details = {
+        "file_name": in_file_name,
+        "size_mb": Path(in_file_name).stat().st_size / 2 ** 20,
+        "n_sci": 0,
+        "n_hk": 0,
+        "time": 0,
+        "error": None,
+    }
+    t_start = time.perf_counter()
+    try:
+        df_sci, _, df_hk, _ = lxrf.read_binary_data(in_file_name=in_file_name,
+                                                    number_of_decimals=number_of_decimals,
+                                                    save_format=save_format)
+        file_details["n_sci"] = len(df_sci)
+        file_details["n_hk"] = len(df_hk)
+    except Exception as e:
+        file_details["error"] = str(e)
+    file_details["time"] = time.perf_counter() - t_start
+
+    return file_details
+
+
+def ingest_files(file_list=None, n_workers=None, number_of_decimals=6, save_format="csv"):
+    """
+    Decodes all the raw files in "file_list" with a pool of processes, one file per worker at a
+    time. The processed files are saved in the "processed_data/sci" and "processed_data/hk" folders,
+    the same as when a binary file is loaded in the GUI.
+
+    Parameters
+    ----------
+    file_list : list
+        List of the raw files. Default is None.
+    n_workers : int
+        Number of processes in the pool. Default is None, which uses the number of CPUs.
+    number_of_decimals : int
+        Number of decimals to save. Default is 6.
+    save_format : str
+        Format of the processed files, one of "lxi_file_read_funcs.save_formats". Default is
+        "csv".
+
+    Returns
+    -------
+    all_file_details : list
+        List of the details of each file, as returned by "ingest_file", in the order of
+        "file_list".
+    """
+    with multiprocessing.Pool(processes=n_workers) as pool:
+        all_file_details = pool.starmap(ingest_file,
+                                        [(file_name, number_of_decimals, save_format)
+                                         for file_name in file_list])
+
+    return all_file_details
+
+
+def print_summary(all_file_details=None, total_time=None):
+    """
+    Prints the number of packets and the throughput for each file in a tabular format.
+
+    Parameters
+    ----------
+    all_file_details : list
+        List of the details of each file, as returned by "ingest_files".
+    total_time : float
+        Wall time for processing all the files, in seconds. Default is None.
+
+    Returns
+    -------
+        None
+    """
+    table = []
+    for file_details in all_file_details:
+        n_packets = file_details["n_sci"] + file_details["n_hk"]
+        time_val = max(file_details["time"], 1e-9)
+        table.append([file_details["file_name"].split("/")[-1], file_details["size_mb"],
+                      file_details["n_sci"], file_details["n_hk"], file_details["time"],
+                      file_details["size_mb"] / time_val, n_packets / time_val,
+                      file_details["error"] or "OK"])
+
+    print(tabulate(table, headers=["File", "Size (MB)", "SCI packets", "HK packets", "Time (s)",
+                                   "MB/s", "Packets/s", "Status"],
+                   tablefmt="fancy_grid", floatfmt=".2f", numalign="center"))
+
+    if total_time is not None:
+        total_size = sum(file_details["size_mb"] for file_details in all_file_details)
+        print(f"\n Processed \x1b[1;32;255m{len(all_file_details)}\x1b[0m files "
+              f"(\x1b[1;32;255m{total_size:.2f} MB\x1b[0m) in \x1b[1;32;255m{total_time:.2f} s"
+              f"\x1b[0m")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decode LEXI raw files into processed science and housekeeping files."
+    )
+    parser.add_argument("path", help="Directory with the raw files, or a glob pattern.")
+    parser.add_argument("-p", "--pattern", default="*_LEXI_raw_*.txt",
+                        help="Pattern of the raw files when path is a directory.")
+    parser.add_argument("-n", "--n_workers", type=int, default=None,
+                        help="Number of processes. Default is the number of CPUs.")
+    parser.add_argument("-d", "--number_of_decimals", type=int, default=6,
+                        help="Number of decimals to save.")
+    parser.add_argument("-f", "--save_format", default="csv", choices=lxrf.save_formats,
+                        help="Format of the processed files.")
+    args = parser.parse_args()
+
+    file_list = find_raw_files(path=args.path, pattern=args.pattern)
+    if len(file_list) == 0:
+        print(f"\n \x1b[1;31;255m No raw files found in {args.path} \x1b[0m")
+        return
+
+    t_start = time.perf_counter()
+    all_file_details = ingest_files(file_list=file_list, n_workers=args.n_workers,
+                                    number_of_decimals=args.number_of_decimals,
+                                    save_format=args.save_format)
+    print_summary(all_file_details=all_file_details, total_time=time.perf_counter() - t_start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+import glob
+import importlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import lxi_file_read_funcs as lxrf
+
+importlib.reload(lxrf)
+
+
+def find_file_type(file_val=None):
+    """
+    Finds whether a processed file has science or housekeeping data from its name, as given by
+    "lxi_file_read_funcs.processed_file_name".
+
+    Parameters
+    ----------
+    file_val : str
+        Path to the processed file. Default is None.
+
+    Returns
+    -------
+    file_type : str
+        Either "sci" or "hk", or None if it can not be found from the name.
+    """
+    file_name = Path(file_val).name
+    for file_type in ["sci", "hk"]:
+        if f"_{file_type}_output" in file_name or Path(file_val).parent.name == file_type:
+            return file_type
+
+    return None
+
+
+class campaign_store():
+    """
+    Class for the data of a campaign, which is spread over many processed science and
+    housekeeping files, for example one per test. The files are registered with their time range,
+    and a time window is read by opening only the files which overlap it, and reading only the
+    rows in the window from each of them (see "lxi_file_read_funcs.read_processed_file"). So a
+    window of a few minutes of a campaign of many days only loads these few minutes.
+
+    The offsets of the channels, used to compute the x and y-coordinates of the science data, are
+    the ones of the whole campaign and not of a window: they are found from the sum of the
+    histograms of the voltages of the channels of each science file (see "campaign_offsets"). The
+    histograms of a file are computed when it is registered, so the offsets are found without
+    reading any file.
+
+    The list of the registered files, with the histograms, can be saved to a json catalog, so that
+    the time ranges and the histograms do not have to be found again the next time.
+
+    Attributes:
+        files: list
+            The registered files, each one a dict with its "file_name", "file_type" ("sci" or
+            "hk"), first and last time "t_min" and "t_max", the "size" and "mtime" of the file
+            when its time range was found, and the "channel_histograms" of a science file (None
+            for a housekeeping file).
+    """
+
+    def __init__(self):
+        self.files = []
+
+    def register(self, file_val=None, file_type=None):
+        """
+        Registers a processed file. A science file is read in full to find its time range and the
+        histograms of the voltages of its channels, with "lxi_file_read_funcs.channel_histogram".
+        Only the time column of a housekeeping file is read. If the file is already registered, it
+        is read again.
+
+        Parameters
+        ----------
+        file_val : str
+            Path to the processed file. Default is None.
+        file_type : str
+            Either "sci" or "hk". Default is None, in which case it is found from the name of the
+            file with "find_file_type".
+
+        Raises
+        ------
+        FileNotFoundError :
+            If the file does not exist.
+        ValueError :
+            If the type of the file is not given and can not be found from its name.
+
+        Returns
+        -------
+        file_details : dict
+            The details of the registered file.
+        """
+        if not Path(file_val).is_file():
+            raise FileNotFoundError(
+                f"The file {file_val} does not exist."
+            )
+
+        if file_type is None:
+            file_type = find_file_type(file_val=file_val)
+        if file_type not in ["sci", "hk"]:
+            raise ValueError(
+                f"The type of the file {file_val} must be either \"sci\" or \"hk\"."
+            )
+
+        file_name = Path(file_val).resolve().as_posix()
+        file_stat = Path(file_name).stat()
+        channel_histograms = None
+        if file_type == "sci":
+            df = lxrf.read_processed_file(file_val=file_name)
+            t_min, t_max = None, None
+            if len(df) > 0:
+                t_min, t_max = float(np.nanmin(df.index)), float(np.nanmax(df.index))
+            # The histograms are kept as lists, so that they can be saved to the json catalog
+            channel_histograms = {key: lxrf.channel_histogram(v=lxrf.channel_data(df, key)).tolist()
+                                  for key in ["Channel1", "Channel2", "Channel3", "Channel4"]}
+        else:
+            t_min, t_max = lxrf.processed_file_time_range(file_val=file_name)
+
+        file_details = {
+            "file_name": file_name,
+            "file_type": file_type,
+            "t_min": t_min,
+            "t_max": t_max,
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime_ns,
+            "channel_histograms": channel_histograms,
+        }
+
+        self.files = [details for details in self.files if details["file_name"] != file_name]
+        self.files.append(file_details)
+
+        return file_details
+
+    def register_files(self, path=None, pattern="*_output.*"):
+        """
+        Registers all the processed files in a folder, or matching a glob pattern.
+
+        Parameters
+        ----------
+        path : str
+            Either a folder, in which case all the files matching "pattern" in it and in its
+            subfolders are registered, or a glob pattern. Default is None.
+        pattern : str
+            Pattern of the processed files when "path" is a folder. Default is "*_output.*".
+
+        Returns
+        -------
+        n_files : int
+            Number of registered files.
+        """
+        if Path(path).is_dir():
+            file_list = Path(path).rglob(pattern)
+        else:
+            file_list = [Path(file_name) for file_name in glob.glob(path)]
+
+        n_files = 0
+        for file_name in sorted(file_list):
+            if file_name.is_file() and file_name.suffix.lstrip(".") in lxrf.save_formats:
+                self.register(file_val=file_name.as_posix())
+                n_files += 1
+
+        return n_files
+
+    def overlapping_files(self, file_type=None, t_start=None, t_end=None):
+        """
+        Finds the registered files of one type which have data between "t_start" and "t_end".
+
+        Parameters
+        ----------
+        file_type : str
+            Either "sci" or "hk". Default is None.
+        t_start : float
+            Start time of the window. Default is None, which has no start.
+        t_end : float
+            End time of the window. Default is None, which has no end.
+
+        Returns
+        -------
+        file_list : list
+            The details of the files, sorted by their first time.
+        """
+        file_list = [details for details in self.files
+                     if details["file_type"] == file_type and details["t_min"] is not None and
+                     (t_start is None or details["t_max"] >= t_start) and
+                     (t_end is None or details["t_min"] <= t_end)]
+
+        return sorted(file_list, key=lambda details: details["t_min"])
+
+    def campaign_offsets(self):
+        """
+        Finds the offset of each channel for the whole campaign, from the sum of the histograms of
+        the voltage of the channel of all the registered science files, found when they were
+        registered, with "lxi_file_read_funcs.histogram_offset". No file is read.
+
+        Returns
+        -------
+        channel_offsets : dict
+            Offset of the voltage of each channel, from "Channel1" to "Channel4", or None if there
+            is no science file.
+        """
+        channels = ["Channel1", "Channel2", "Channel3", "Channel4"]
+        file_list = self.overlapping_files(file_type="sci")
+        if len(file_list) == 0:
+            return None
+
+        hist_sum = {key: np.sum([details["channel_histograms"][key] for details in file_list], axis=0)
+                    for key in channels}
+
+        return {key: lxrf.histogram_offset(hist_v=hist_sum[key]) for key in channels}
+
+    def iter_window(self, file_type=None, t_start=None, t_end=None):
+        """
+        Reads the rows between "t_start" and "t_end" of the files of one type, one file at a time.
+        The science data also gets the x and y-coordinates, computed with the offsets of the
+        campaign (see "campaign_offsets"), so that they do not depend on the window.
+
+        Parameters
+        ----------
+        file_type : str
+            Either "sci" or "hk". Default is None.
+        t_start : float
+            Start time of the window. Default is None, which has no start.
+        t_end : float
+            End time of the window. Default is None, which has no end.
+
+        Yields
+        ------
+            df : pandas.DataFrame
+                The rows of one file in the window, sorted by time, with "TimeStamp" as the index.
+        """
+        file_list = self.overlapping_files(file_type=file_type, t_start=t_start, t_end=t_end)
+        if file_type == "sci" and len(file_list) > 0:
+            channel_offsets = self.campaign_offsets()
+
+        for details in file_list:
+            # A file which is entirely in the window is read without the filter on the time
+            if ((t_start is None or details["t_min"] >= t_start) and
+                    (t_end is None or details["t_max"] <= t_end)):
+                df = lxrf.read_processed_file(file_val=details["file_name"])
+            else:
+                df = lxrf.read_processed_file(file_val=details["file_name"], t_start=t_start,
+                                              t_end=t_end)
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
+
+            if file_type == "sci":
+                yield lxrf.add_positions(df=df, channel_offsets=channel_offsets)
+            else:
+                yield lxrf.apply_schema(df=df, schema=lxrf.hk_schema)
+
+    def get_window(self, file_type=None, t_start=None, t_end=None):
+        """
+        Gets the data of one type between "t_start" and "t_end", from all the files which overlap
+        the window, as read by "iter_window". The whole window is loaded in memory as one
+        dataframe, so "iter_window" should be used instead to go through a large window one file
+        at a time. The dataframe is only sorted again if the files overlap in time.
+
+        Parameters
+        ----------
+        file_type : str
+            Either "sci" or "hk". Default is None.
+        t_start : float
+            Start time of the window. Default is None, which has no start.
+        t_end : float
+            End time of the window. Default is None, which has no end.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The data in the window, sorted by time, or None if no file overlaps the window.
+        """
+        if len(self.overlapping_files(file_type=file_type, t_start=t_start, t_end=t_end)) == 0:
+            return None
+
+        df = pd.concat(self.iter_window(file_type=file_type, t_start=t_start, t_end=t_end))
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="stable")
+
+        if file_type == "sci":
+            df.attrs["channel_offsets"] = self.campaign_offsets()
+
+        return df
+
+    def time_range(self, file_type=None):
+        """
+        Finds the first and the last time of the registered files of one type.
+
+        Parameters
+        ----------
+        file_type : str
+            Either "sci" or "hk". Default is None.
+
+        Returns
+        -------
+        t_min : float
+            The first time, or None if there is no file.
+        t_max : float
+            The last time, or None if there is no file.
+        """
+        file_list = self.overlapping_files(file_type=file_type)
+        if len(file_list) == 0:
+            return None, None
+
+        return (min(details["t_min"] for details in file_list),
+                max(details["t_max"] for details in file_list))
+
+    def load_window(self, t_start=None, t_end=None):
+        """
+        Puts the science and housekeeping data between "t_start" and "t_end", from "get_window", in
+        the data store of the session with "lxi_file_read_funcs.set_loaded_data", so that the
+        histogram and the time series tabs plot it. The science data has the offsets of the
+        campaign. As with "get_window", the whole window is loaded in memory.
+
+        Parameters
+        ----------
+        t_start : float
+            Start time of the window. Default is None, which has no start.
+        t_end : float
+            End time of the window. Default is None, which has no end.
+
+        Returns
+        -------
+            None
+        """
+        for file_type in ["sci", "hk"]:
+            df = self.get_window(file_type=file_type, t_start=t_start, t_end=t_end)
+            if df is not None:
+                lxrf.set_loaded_data(file_type=file_type, df_all=df)
+
+    def save_catalog(self, catalog_file=None):
+        """
+        Saves the list of the registered files, with their histograms, to a json file.
+
+        Parameters
+        ----------
+        catalog_file : str
+            Name of the json file. Default is None.
+
+        Returns
+        -------
+            None
+        """
+        with open(catalog_file, 'w') as file:
+            json.dump(self.files, file, indent=4)
+
+    @classmethod
+    def from_catalog(cls, catalog_file=None):
+        """
+        Creates a campaign store from a json file saved by "save_catalog". The files which have
+        changed since the catalog was saved are registered again, so their histograms are computed
+        again, and the ones which do not exist anymore are dropped.
+
+        Parameters
+        ----------
+        catalog_file : str
+            Name of the json file. Default is None.
+
+        Returns
+        -------
+        store : campaign_store
+            The campaign store.
+        """
+        store = cls()
+        with open(catalog_file, 'r') as file:
+            file_list = json.load(file)
+
+        for details in file_list:
+            if not Path(details["file_name"]).is_file():
+                continue
+            file_stat = Path(details["file_name"]).stat()
+            if file_stat.st_size == details["size"] and file_stat.st_mtime_ns == details["mtime"]:
+                store.files.append(details)
+            else:
+                store.register(file_val=details["file_name"], file_type=details["file_type"])
+
+        return store
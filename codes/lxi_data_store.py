@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+
+def time_slice(df=None, t_start=None, t_end=None):
+    """
+    Selects the rows of a dataframe sorted by time between "t_start" and "t_end", both included.
+    The rows are found with a binary search of the index and selected by position, so the
+    returned dataframe is a view of "df" and no data is copied.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe, with the time as a sorted index. Default is None.
+    t_start : float
+        Start time of the rows. Default is None, which starts at the first row.
+    t_end : float
+        End time of the rows. Default is None, which ends at the last row.
+
+    Returns
+    -------
+    df_slice : pandas.DataFrame
+        The rows between "t_start" and "t_end".
+    """
+    index = df.index.to_numpy()
+    i_start = 0 if t_start is None else np.searchsorted(index, t_start, side="left")
+    i_end = len(index) if t_end is None else np.searchsorted(index, t_end, side="right")
+
+    return df.iloc[i_start:i_end]
+
+
+class data_store():
+    """
+    Class for keeping one dataframe per dataset, for example the science and the housekeeping data
+    of the loaded file. Each dataframe is sorted by time once when it is added, and the time
+    windows are given as views of it with "time_slice", so that a selection does not copy the
+    data. The columns derived from the data, such as the x and y-coordinates, are computed on the
+    whole dataframe before it is added, so the views already have them.
+
+    Each dataset has a version which is increased every time its dataframe changes, so that the
+    results computed from a dataset can be cached and thrown away once it changes.
+
+    Attributes:
+        frames: dict
+            The dataframe of each dataset, sorted by time.
+        versions: dict
+            The version of each dataset.
+    """
+
+    def __init__(self):
+        self.frames = {}
+        self.versions = {}
+
+    def set_frame(self, name=None, df=None):
+        """
+        Adds the dataframe of a dataset, replacing the previous one.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset, for example "sci" or "hk". Default is None.
+        df : pandas.DataFrame
+            The dataframe, with the time as the index. It is sorted if it is not sorted already.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The sorted dataframe kept in the store.
+        """
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        self.frames[name] = df
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+        return df
+
+    def append(self, name=None, df_new=None):
+        """
+        Appends new rows to the dataframe of a dataset. The dataframe is only sorted again if the
+        new rows are not all after the ones already in it.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset. Default is None.
+        df_new : pandas.DataFrame
+            The new rows, with the time as the index.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The dataframe kept in the store.
+        """
+        df = self.frames.get(name)
+        if df is None or len(df) == 0:
+            return self.set_frame(name=name, df=df_new)
+        if len(df_new) == 0:
+            return df
+
+        return self.set_frame(name=name, df=pd.concat([df, df_new]))
+
+    def frame(self, name=None):
+        """
+        Gets the whole dataframe of a dataset.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset. Default is None.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            The dataframe, or None if the dataset is not in the store.
+        """
+        return self.frames.get(name)
+
+    def view(self, name=None, t_start=None, t_end=None):
+        """
+        Gets the rows of a dataset between "t_start" and "t_end", as a view of its dataframe.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset. Default is None.
+        t_start : float
+            Start time of the rows. Default is None, which starts at the first row.
+        t_end : float
+            End time of the rows. Default is None, which ends at the last row.
+
+        Returns
+        -------
+        df_slice : pandas.DataFrame
+            The rows between "t_start" and "t_end".
+        """
+        return time_slice(df=self.frames[name], t_start=t_start, t_end=t_end)
+
+    def version(self, name=None):
+        """
+        Gets the version of a dataset, which changes every time its dataframe changes.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset. Default is None.
+
+        Returns
+        -------
+        version : int
+            The version, or 0 if the dataset has never been added.
+        """
+        return self.versions.get(name, 0)
+
+    def time_range(self, name=None):
+        """
+        Gets the first and the last time of a dataset.
+
+        Parameters
+        ----------
+        name : str
+            Name of the dataset. Default is None.
+
+        Returns
+        -------
+        t_min : float
+            The first time.
+        t_max : float
+            The last time.
+        """
+        df = self.frames[name]
+        if len(df) == 0:
+            return None, None
+
+        return df.index[0], df.index[-1]
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+def default_cache_dir():
+    """
+    Gets the default folder of the decode cache, outside of the repository: the "LEXI_CACHE_DIR"
+    environment variable if it is set, else the "lexi" folder in the cache folder of the user
+    ("XDG_CACHE_HOME", or "~/.cache", and "LOCALAPPDATA" on Windows).
+
+    Returns
+    -------
+    cache_dir : str
+        Folder of the decode cache.
+    """
+    if os.environ.get("LEXI_CACHE_DIR"):
+        return os.environ["LEXI_CACHE_DIR"]
+
+    user_cache_dir = os.environ.get("XDG_CACHE_HOME") or os.environ.get("LOCALAPPDATA")
+    if not user_cache_dir:
+        user_cache_dir = Path.home() / ".cache"
+
+    return (Path(user_cache_dir) / "lexi").as_posix()
+
+
+class decode_cache():
+    """
+    Class for caching the decoded data of binary files on disk, so that a binary file which has
+    already been loaded does not have to be decoded again.
+
+    Each entry is saved as one uncompressed npz file which has all the columns of the science and
+    the housekeeping dataframes, and their "attrs" (for example the offsets of the channels) as
+    json. The name of the entry is a hash of the path, size and modification
+    time of the binary file, of the version of the decoder and, optionally, of the content of the
+    binary file. So if the file or the decoder changes, the old entry is not used anymore. Once the
+    total size of the cache is above "max_size_mb", the entries which were used the longest time
+    ago are deleted.
+
+    Attributes:
+        cache_dir: str
+            Folder where the entries are saved. Default is None, in which case it is given by
+            "default_cache_dir".
+        max_size_mb: float
+            Maximum size of the cache on disk, in MB. Default is 2048.
+        hash_content: bool
+            Whether to also hash the content of the binary file for the name of the entry. This
+            catches changes which keep the size and the modification time, but the whole file has
+            to be read to compute the hash. Default is False.
+    """
+
+    def __init__(self, cache_dir=None, max_size_mb=2048, hash_content=False):
+        if cache_dir is None:
+            cache_dir = default_cache_dir()
+        self.cache_dir = cache_dir
+        self.max_size_mb = max_size_mb
+        self.hash_content = hash_content
+
+    def entry_name(self, in_file_name=None, version=None):
+        """
+        Gets the name of the cache entry of a binary file.
+
+        Parameters
+        ----------
+        in_file_name : str
+            Name of the binary file. Default is None.
+        version : int, str or list
+            Version of the decoder, and the options which change the decoded data. Default is None.
+
+        Returns
+        -------
+        entry_name : str
+            Path of the npz file of the entry.
+        """
+        file_stat = Path(in_file_name).stat()
+        key = {
+            "file_name": Path(in_file_name).resolve().as_posix(),
+            "size": file_stat.st_size,
+            "mtime": file_stat.st_mtime_ns,
+            "version": version,
+        }
+        if self.hash_content:
+            content_hash = hashlib.blake2b()
+            with open(in_file_name, 'rb') as file:
+                for block in iter(lambda: file.read(2 ** 20), b""):
+                    content_hash.update(block)
+            key["content"] = content_hash.hexdigest()
+
+        key_hash = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+        return f"{self.cache_dir}/{key_hash}.npz"
+
+    def load(self, in_file_name=None, version=None):
+        """
+        Loads the decoded data of a binary file from the cache.
+
+        Parameters
+        ----------
+        in_file_name : str
+            Name of the binary file. Default is None.
+        version : int, str or list
+            Version of the decoder, and the options which change the decoded data. Default is None.
+
+        Returns
+        -------
+        df_sci : pandas.DataFrame
+            The science dataframe, or None if the file is not in the cache.
+        df_hk : pandas.DataFrame
+            The housekeeping dataframe, or None if the file is not in the cache.
+        """
+        entry_name = self.entry_name(in_file_name=in_file_name, version=version)
+        if not Path(entry_name).is_file():
+            return None, None
+
+        try:
+            with np.load(entry_name) as data:
+                all_data = {"sci": {}, "hk": {}}
+                all_attrs = {"sci": {}, "hk": {}}
+                for key in data.files:
+                    file_type, column = key.split("/", 1)
+                    if file_type == "attrs":
+                        all_attrs[column] = json.loads(str(data[key]))
+                    else:
+                        all_data[file_type][column] = data[key]
+        except Exception as e:
+            print(f"\n \x1b[1;31;255m Could not read the cache entry {entry_name}: {e} \x1b[0m")
+            return None, None
+
+        # Mark the entry as the most recently used one
+        os.utime(entry_name)
+
+        df_sci = pd.DataFrame(all_data["sci"]).set_index("TimeStamp")
+        df_hk = pd.DataFrame(all_data["hk"]).set_index("TimeStamp")
+        df_sci.attrs.update(all_attrs["sci"])
+        df_hk.attrs.update(all_attrs["hk"])
+
+        return df_sci, df_hk
+
+    def save(self, in_file_name=None, version=None, df_sci=None, df_hk=None):
+        """
+        Saves the decoded data of a binary file in the cache, and then deletes the least recently
+        used entries if the cache is too large.
+
+        Parameters
+        ----------
+        in_file_name : str
+            Name of the binary file. Default is None.
+        version : int, str or list
+            Version of the decoder, and the options which change the decoded data. Default is None.
+        df_sci : pandas.DataFrame
+            The science dataframe, with "TimeStamp" as the index. Its "attrs" must be json
+            serializable.
+        df_hk : pandas.DataFrame
+            The housekeeping dataframe, with "TimeStamp" as the index. Its "attrs" must be json
+            serializable.
+
+        Returns
+        -------
+            None
+        """
+        entry_name = self.entry_name(in_file_name=in_file_name, version=version)
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+
+        all_data = {}
+        for file_type, df in [("sci", df_sci), ("hk", df_hk)]:
+            all_data[f"attrs/{file_type}"] = np.array(json.dumps(df.attrs))
+            df = df.reset_index()
+            for column in df.columns:
+                all_data[f"{file_type}/{column}"] = df[column].to_numpy()
+
+        # Write to a temporary file first so that an entry is never half written
+        temp_name = entry_name[:-len(".npz")] + ".tmp.npz"
+        np.savez(temp_name, **all_data)
+        os.replace(temp_name, entry_name)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Deletes the least recently used entries until the size of the cache is below
+        "max_size_mb".
+
+        Returns
+        -------
+            None
+        """
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry)
+                   for entry in Path(self.cache_dir).glob("*.npz")]
+        total_size = sum(entry[1] for entry in entries)
+
+        for _, size, entry in sorted(entries):
+            if total_size <= self.max_size_mb * 2 ** 20:
+                break
+            entry.unlink()
+            total_size -= size
+
+    def clear(self):
+        """
+        Deletes all the entries of the cache.
+
+        Returns
+        -------
+            None
+        """
+        for entry in Path(self.cache_dir).glob("*.npz"):
+            entry.unlink()
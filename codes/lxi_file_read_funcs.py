@@ -1,6 +1,10 @@
-import csv
+import functools
 import importlib
+import mmap
+import multiprocessing
+import os
 import struct
+import zipfile
 from pathlib import Path
 from tkinter import filedialog
 from typing import NamedTuple
@@ -9,8 +13,12 @@ import numpy as np
 import pandas as pd
 
 import global_variables
+import lxi_data_store as lxds
+import lxi_decode_cache as lxdc
 import lxi_misc_codes as lmsc
 
+importlib.reload(lxds)
+importlib.reload(lxdc)
 importlib.reload(lmsc)
 
 # Tha packet format of the science and housekeeping packets
@@ -21,6 +29,49 @@ packet_format_hk = ">II4H"
 sync = b'\xfe\x6b\x28\x40'
 volts_per_count = 4.5126 / 65536  # volts per increment of digitization
 
+# Number of bytes in a packet. Both the science and housekeeping packets have the same size.
+packet_size = struct.calcsize(packet_format_sci)
+
+# Formats in which the processed science and housekeeping data can be saved. "parquet" and
+# "feather" need the optional "pyarrow" package.
+save_formats = ["csv", "npz", "parquet", "feather"]
+
+# Version of the decoder. It is part of the name of the entries in the decode cache, so it must be
+# increased whenever a change to the decoding changes the decoded data.
+decoder_version = 2
+
+# Cache of the decoded binary files, used by "read_binary_file" when "use_cache" is True. It is
+# kept in the cache folder of the user (see "lxi_decode_cache.default_cache_dir")
+raw_file_cache = lxdc.decode_cache(max_size_mb=2048)
+
+# Number of bytes searched for the sync word in one go
+scan_block_size = 2 ** 24
+
+# Data types of the columns of the science and housekeeping dataframes kept in memory, applied by
+# "apply_schema". The time stamps stay float64, since float32 can not hold milliseconds over the
+# length of a mission. The saved files keep the full precision of the decoded data.
+sci_schema = {
+    "IsCommanded": bool,
+    "Channel1": np.float32, "Channel2": np.float32, "Channel3": np.float32,
+    "Channel4": np.float32,
+    "Count1": np.uint16, "Count2": np.uint16, "Count3": np.uint16, "Count4": np.uint16,
+    "x_val": np.float32, "y_val": np.float32,
+    "v1_shift": np.float32, "v2_shift": np.float32, "v3_shift": np.float32,
+    "v4_shift": np.float32,
+}
+# The columns of the calibrated values are NaN until the first packet of their "hk_id", so they
+# are floats even for the ones which are counters, such as "Cmd_count"
+hk_schema = {
+    "HK_id": np.uint8,
+    "PinPullerTemp": np.float32, "OpticsTemp": np.float32, "LEXIbaseTemp": np.float32,
+    "HVsupplyTemp": np.float32, "+5.2V_Imon": np.float32, "+10V_Imon": np.float32,
+    "+3.3V_Imon": np.float32, "AnodeVoltMon": np.float32, "+28V_Imon": np.float32,
+    "ADC_Ground": np.float32, "Cmd_count": np.float32, "Pinpuller_Armed": np.float32,
+    "Unused1": np.float32, "Unused2": np.float32, "HVmcpAuto": np.float32,
+    "HVmcpMan": np.float32,
+    "DeltaEvntCount": np.uint16, "DeltaDroppedCount": np.uint16, "DeltaLostEvntCount": np.uint16,
+}
+
 class sci_packet(NamedTuple):
     """
     Class for the science packet.
@@ -121,10 +172,768 @@ class hk_packet_cls(NamedTuple):
             )
 
 
+class packet_array():
+    """
+    Class for keeping decoded packets as one typed array per field, instead of one object per
+    packet. It can be sliced like a numpy array, e.g. "packets[10:20]" or "packets[mask]", and
+    "concatenate" joins several of them. The fields are the same as in "sci_packet" and
+    "hk_packet_cls", but the voltages are kept as ADC counts.
+
+    Attributes:
+        time_stamp: numpy.ndarray
+            Timestamp of the packets in milliseconds (uint32).
+        is_commanded: numpy.ndarray
+            Whether the packets were commanded (bool).
+        is_hk: numpy.ndarray
+            Whether the packets are housekeeping packets (bool).
+        channel1, channel2, channel3, channel4: numpy.ndarray
+            ADC counts of the four channels (uint16). For the housekeeping packets, "channel1" has
+            the "hk_id" and the "hk_value", and the other three channels have the delta event,
+            dropped event and lost event counts.
+    """
+
+    dtypes = {
+        "time_stamp": np.uint32,
+        "is_commanded": np.bool_,
+        "is_hk": np.bool_,
+        "channel1": np.uint16,
+        "channel2": np.uint16,
+        "channel3": np.uint16,
+        "channel4": np.uint16,
+    }
+
+    def __init__(self, time_stamp=None, is_commanded=None, is_hk=None, channel1=None,
+                 channel2=None, channel3=None, channel4=None):
+        columns = {"time_stamp": time_stamp, "is_commanded": is_commanded, "is_hk": is_hk,
+                   "channel1": channel1, "channel2": channel2, "channel3": channel3,
+                   "channel4": channel4}
+        for key, dtype in self.dtypes.items():
+            if columns[key] is None:
+                columns[key] = np.empty(0, dtype=dtype)
+            setattr(self, key, np.asarray(columns[key], dtype=dtype))
+
+    def __len__(self):
+        return len(self.time_stamp)
+
+    def __getitem__(self, index):
+        return packet_array(**{key: getattr(self, key)[index] for key in self.dtypes})
+
+    @classmethod
+    def concatenate(cls, packet_arrays=None):
+        """
+        Joins several packet arrays into one.
+
+        Parameters
+        ----------
+        packet_arrays : list
+            List of "packet_array".
+
+        Returns
+        -------
+        packets : packet_array
+            All the packets, in the order of the list.
+        """
+        packet_arrays = [cls()] + list(packet_arrays)
+        return cls(**{key: np.concatenate([getattr(packets, key) for packets in packet_arrays])
+                      for key in cls.dtypes})
+
+    def hk_id(self):
+        """
+        Gets the "hk_id" of the housekeeping packets, which tells what "hk_value" is.
+
+        Returns
+        -------
+        hk_id : numpy.ndarray
+            The "hk_id" of each packet (uint8), from 0 to 15.
+        """
+        return ((self.channel1 & 0xf000) >> 12).astype(np.uint8)
+
+    def hk_value(self):
+        """
+        Gets the "hk_value" of the housekeeping packets, the same as "hk_packet_cls.from_bytes".
+
+        Returns
+        -------
+        hk_value : numpy.ndarray
+            The "hk_value" of each packet (uint16).
+        """
+        hk_id = self.hk_id()
+        # For "Cmd_count" and "Pinpuller_Armed" the value is not up-shifted by 4 bits
+        return np.where((hk_id == 10) | (hk_id == 11), self.channel1 & 0xfff,
+                        (self.channel1 & 0xfff) << 4).astype(np.uint16)
+
+    def to_dataframe(self):
+        """
+        Converts the packets to a dataframe, with one column per field. The columns use the same
+        memory as the arrays, nothing is copied.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+            DataFrame of the packets.
+        """
+        return pd.DataFrame({key: getattr(self, key) for key in self.dtypes}, copy=False)
+
+
+def read_raw_data(in_file_name=None, use_mmap=False):
+    """
+    Reads the raw data from a binary file. With "use_mmap" the file is memory-mapped instead of
+    being read, so the data is decoded straight from the mapped pages and the file does not have to
+    fit in memory.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the input file. Default is None.
+    use_mmap : bool
+        Whether to memory-map the file instead of reading it. Default is False.
+
+    Returns
+    -------
+    raw : bytes or mmap.mmap
+        The raw data of the file. If it is a memory map, it must be closed once it is not needed
+        anymore.
+    """
+    with open(in_file_name, 'rb') as file:
+        # An empty file can not be memory-mapped
+        if use_mmap and Path(in_file_name).stat().st_size > 0:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return file.read()
+
+
+def decode_file(in_file_name=None, use_mmap=False, n_workers=1):
+    """
+    Reads a binary file and decodes all the packets in it.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the input file. Default is None.
+    use_mmap : bool
+        Whether to memory-map the file instead of reading it. Default is False.
+    n_workers : int
+        Number of processes used to decode the file. If it is not 1, the file is decoded with
+        "decode_file_parallel" and "use_mmap" is not used. Default is 1.
+
+    Returns
+    -------
+    packets : packet_array
+        The decoded packets.
+    """
+    if n_workers != 1:
+        return decode_file_parallel(in_file_name=in_file_name, n_workers=n_workers)
+
+    raw = read_raw_data(in_file_name=in_file_name, use_mmap=use_mmap)
+    try:
+        packets = decode_packets(raw)
+    finally:
+        if isinstance(raw, mmap.mmap):
+            raw.close()
+
+    return packets
+
+
+def packet_index_file_name(in_file_name=None):
+    """
+    Gets the name of the sidecar file with the packet index of a binary file.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the binary file. Default is None.
+
+    Returns
+    -------
+    index_file_name : str
+        Name of the index file, next to the binary file.
+    """
+    return f"{in_file_name}.index.npz"
+
+
+def build_packet_index(in_file_name=None, step=1024, save_file=True):
+    """
+    Builds the packet index of a binary file, which is used by "decode_file_window" to decode only
+    the part of the file in a time window. The packets of the file are split into blocks of "step"
+    packets, and the index has the byte offset of the first packet of each block along with the
+    earliest and the latest timestamp in the block. The timestamps are not always increasing, so
+    the earliest and the latest ones are kept instead of only the first one.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the binary file. Default is None.
+    step : int
+        Number of packets in a block. Default is 1024.
+    save_file : bool
+        Whether to save the index to the file given by "packet_index_file_name". Default is True.
+
+    Returns
+    -------
+    packet_index : dict
+        Dictionary with the byte offset ("offset"), the earliest ("t_min") and the latest
+        ("t_max") timestamp in seconds of each block, as well as the size ("file_size") and the
+        modification time ("file_mtime") of the binary file and the decoder version
+        ("decoder_version") used to check that the index is still valid.
+    """
+    file_stat = Path(in_file_name).stat()
+    raw = read_raw_data(in_file_name=in_file_name, use_mmap=True)
+    try:
+        packet_starts = find_packet_index(raw)
+        time_stamp = gather_packets(raw=raw, packet_index=packet_starts).time_stamp / 1e3
+    finally:
+        if isinstance(raw, mmap.mmap):
+            raw.close()
+
+    block_starts = np.arange(0, len(packet_starts), step)
+    t_min, t_max = np.empty(0), np.empty(0)
+    if len(block_starts) > 0:
+        t_min = np.minimum.reduceat(time_stamp, block_starts)
+        t_max = np.maximum.reduceat(time_stamp, block_starts)
+
+    packet_index = {
+        "offset": packet_starts[block_starts].astype(np.int64),
+        "t_min": t_min,
+        "t_max": t_max,
+        "file_size": file_stat.st_size,
+        "file_mtime": file_stat.st_mtime_ns,
+        "decoder_version": decoder_version,
+    }
+
+    if save_file:
+        np.savez(packet_index_file_name(in_file_name), **packet_index)
+
+    return packet_index
+
+
+def load_packet_index(in_file_name=None, step=1024):
+    """
+    Loads the packet index of a binary file from its sidecar file. If there is no index yet, or if
+    the binary file or the decoder changed since it was built, the index is built again and saved.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the binary file. Default is None.
+    step : int
+        Number of packets in a block, if the index is built. Default is 1024.
+
+    Returns
+    -------
+    packet_index : dict
+        The packet index, as returned by "build_packet_index".
+    """
+    index_file_name = packet_index_file_name(in_file_name)
+    if Path(index_file_name).is_file():
+        with np.load(index_file_name) as data:
+            packet_index = {key: data[key] for key in data.files}
+        file_stat = Path(in_file_name).stat()
+        if (packet_index["file_size"] == file_stat.st_size and
+                packet_index["file_mtime"] == file_stat.st_mtime_ns and
+                packet_index["decoder_version"] == decoder_version):
+            return packet_index
+
+    try:
+        return build_packet_index(in_file_name=in_file_name, step=step, save_file=True)
+    except OSError:
+        # The folder of the binary file might be read-only, so the index is not saved
+        return build_packet_index(in_file_name=in_file_name, step=step, save_file=False)
+
+
+def decode_file_window(in_file_name=None, t_start=None, t_end=None):
+    """
+    Decodes only the packets of a binary file with a timestamp between "t_start" and "t_end". The
+    blocks of the packet index which have packets in the time window are found first, and only the
+    bytes of these blocks are read and decoded. The packets are the same as the ones from
+    "decode_file" which are in the time window.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the binary file. Default is None.
+    t_start : float
+        Start time of the window in seconds. Default is None, which starts at the first packet.
+    t_end : float
+        End time of the window in seconds. Default is None, which ends at the last packet.
+
+    Returns
+    -------
+    packets : packet_array
+        The decoded packets in the time window, in the order of the file.
+    """
+    if t_start is None:
+        t_start = -np.inf
+    if t_end is None:
+        t_end = np.inf
+
+    packet_index = load_packet_index(in_file_name=in_file_name)
+    in_window = np.flatnonzero((packet_index["t_max"] >= t_start) &
+                               (packet_index["t_min"] <= t_end))
+    if len(in_window) == 0:
+        return packet_array()
+
+    # Read from the first to the end of the last block in the window. A block starts with a packet,
+    # so the sync word search gives the same packets as for the whole file.
+    byte_start = packet_index["offset"][in_window[0]]
+    if in_window[-1] + 1 < len(packet_index["offset"]):
+        byte_stop = packet_index["offset"][in_window[-1] + 1]
+        # Read one more packet, so that the last packet of the block is not at the end of the data
+        n_read = byte_stop - byte_start + packet_size + 1
+    else:
+        byte_stop = None
+        n_read = -1
+
+    with open(in_file_name, 'rb') as file:
+        file.seek(byte_start)
+        raw = file.read(n_read)
+
+    packet_starts = find_packet_index(raw)
+    if byte_stop is not None:
+        packet_starts = packet_starts[packet_starts < byte_stop - byte_start]
+    packets = gather_packets(raw=raw, packet_index=packet_starts)
+
+    time_stamp = packets.time_stamp / 1e3
+    return packets[(time_stamp >= t_start) & (time_stamp <= t_end)]
+
+
+def decode_file_parallel(in_file_name=None, n_workers=None, shard_size=None):
+    """
+    Decodes all the packets in a binary file with a pool of processes. The file is split into byte
+    ranges (shards) which are decoded in two passes:
+    - each worker finds all the sync words in its shard,
+    - the packet starts are then selected from the sync words of the whole file, in the same way
+      as in "find_packet_index", which takes care of the packets that straddle two shards,
+    - each worker then copies the packets which start in its shard.
+    The packets are returned in the order of the file and are the same as the ones from a serial
+    decode.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the input file. Default is None.
+    n_workers : int
+        Number of processes in the pool. Default is None, which uses the number of CPUs.
+    shard_size : int
+        Number of bytes in a shard. Default is None, which splits the file into four shards per
+        worker, with at most 64 MB per shard.
+
+    Returns
+    -------
+    packets : packet_array
+        The decoded packets.
+    """
+    if n_workers is None:
+        n_workers = os.cpu_count()
+
+    # Packets can only start before "file_size - packet_size", same as the serial decode
+    n_search = Path(in_file_name).stat().st_size - packet_size
+    if n_search <= 0:
+        return packet_array()
+
+    if shard_size is None:
+        shard_size = min(max(-(-n_search // (4 * n_workers)), 2 ** 20), 2 ** 26)
+    shard_edges = list(range(0, n_search, shard_size)) + [n_search]
+
+    with multiprocessing.Pool(processes=n_workers) as pool:
+        candidates = pool.map(scan_shard, [
+            (in_file_name, shard_start, shard_stop)
+            for shard_start, shard_stop in zip(shard_edges[:-1], shard_edges[1:])
+        ])
+        packet_index = select_packet_starts(np.concatenate(candidates))
+
+        # Give each worker the packets which start in its shard
+        shard_index = np.split(packet_index, np.searchsorted(packet_index, shard_edges[1:-1]))
+        packets = pool.map(gather_shard, [
+            (in_file_name, index) for index in shard_index if len(index) > 0
+        ])
+
+    return packet_array.concatenate(packets)
+
+
+def scan_shard(shard=None):
+    """
+    Finds the sync words in one shard of a binary file. Used by "decode_file_parallel".
+
+    Parameters
+    ----------
+    shard : tuple
+        Name of the file, and the first and the last (excluded) byte of the shard.
+
+    Returns
+    -------
+    candidates : numpy.ndarray
+        Byte offsets in the file of all the sync words which start in the shard.
+    """
+    in_file_name, shard_start, shard_stop = shard
+    with open(in_file_name, 'rb') as file:
+        file.seek(shard_start)
+        # Read a few more bytes to get the whole sync word at the end of the shard
+        raw = file.read(shard_stop - shard_start + len(sync) - 1)
+
+    return find_sync_words(raw=raw, n_search=shard_stop - shard_start) + shard_start
+
+
+def gather_shard(shard=None):
+    """
+    Copies the packets of one shard out of a binary file. Used by "decode_file_parallel".
+
+    Parameters
+    ----------
+    shard : tuple
+        Name of the file, and the byte offsets of the packets in the shard.
+
+    Returns
+    -------
+    packets : packet_array
+        The decoded packets.
+    """
+    in_file_name, packet_index = shard
+    with open(in_file_name, 'rb') as file:
+        file.seek(packet_index[0])
+        raw = file.read(packet_index[-1] - packet_index[0] + packet_size)
+
+    return gather_packets(raw=raw, packet_index=packet_index - packet_index[0])
+
+
+def find_packet_index(raw=None):
+    """
+    Finds the byte offset of every packet in the raw data. A packet starts wherever the sync word
+    is found, and the search then continues after the end of that packet, so a sync word which
+    happens to be inside the data of a packet is not picked up as a new packet.
+
+    Parameters
+    ----------
+    raw : bytes or bytes-like
+        The raw data as read from the binary file.
+
+    Returns
+    -------
+    packet_index : numpy.ndarray
+        Byte offsets of the start of all the packets.
+    """
+    # Packets can only start before "len(raw) - packet_size", same as the byte by byte search
+    n_search = len(raw) - packet_size
+    if n_search <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    return select_packet_starts(find_sync_words(raw=raw, n_search=n_search))
+
+
+def find_sync_words(raw=None, n_search=None):
+    """
+    Finds all the positions in the raw data where the sync word starts, including the ones which
+    might be inside the data of a packet.
+
+    Parameters
+    ----------
+    raw : bytes or bytes-like
+        The raw data.
+    n_search : int
+        Only the positions before "n_search" are searched. "raw" must have at least
+        "n_search + len(sync) - 1" bytes. Default is None, which searches the whole of "raw".
+
+    Returns
+    -------
+    candidates : numpy.ndarray
+        Byte offsets of all the sync words.
+    """
+    raw_bytes = np.frombuffer(raw, dtype=np.uint8)
+    if n_search is None:
+        n_search = len(raw_bytes) - len(sync) + 1
+
+    # Find all the positions with the first byte of the sync word, and keep only those which are
+    # followed by the rest of the sync word. The search is done one block at a time so that the
+    # temporary arrays stay small even for very large files.
+    candidates = [np.empty(0, dtype=np.int64)]
+    for block_start in range(0, n_search, scan_block_size):
+        block_end = min(block_start + scan_block_size, n_search)
+        block_candidates = np.flatnonzero(raw_bytes[block_start:block_end] == sync[0]) + block_start
+        for ii in range(1, len(sync)):
+            block_candidates = block_candidates[raw_bytes[block_candidates + ii] == sync[ii]]
+        candidates.append(block_candidates)
+
+    return np.concatenate(candidates)
+
+
+def select_packet_starts(candidates=None):
+    """
+    Selects the packet starts from the positions of the sync words. The candidates which lie
+    inside the previous packet are dropped.
+
+    Parameters
+    ----------
+    candidates : numpy.ndarray
+        Sorted byte offsets of the sync words, as returned by "find_sync_words".
+
+    Returns
+    -------
+    packet_index : numpy.ndarray
+        Byte offsets of the start of all the packets.
+    """
+    # Any candidate which is at least one packet away from the previous candidate is always a
+    # packet, so only the candidates that are too close to the previous one need to be checked one
+    # by one.
+    gaps = np.diff(candidates)
+    keep = np.ones(len(candidates), dtype=bool)
+    last_start = -packet_size
+    for ii in np.flatnonzero(gaps < packet_size) + 1:
+        if keep[ii - 1]:
+            last_start = candidates[ii - 1]
+        if candidates[ii] - last_start < packet_size:
+            keep[ii] = False
+
+    return candidates[keep]
+
+
+def decode_packets(raw=None):
+    """
+    Decodes all the packets in the raw data in one go.
+
+    Parameters
+    ----------
+    raw : bytes or bytes-like
+        The raw data as read from the binary file.
+
+    Returns
+    -------
+    packets : packet_array
+        The decoded packets.
+    """
+    return gather_packets(raw=raw, packet_index=find_packet_index(raw))
+
+
+def gather_packets(raw=None, packet_index=None):
+    """
+    Decodes the packets starting at the given byte offsets of the raw data. Each field is read
+    straight from the raw data into its array of the "packet_array". The layout of a packet is the
+    one of "packet_format_sci": the sync word, the time word and the four channels, all big-endian.
+
+    Parameters
+    ----------
+    raw : bytes or bytes-like
+        The raw data.
+    packet_index : numpy.ndarray
+        Byte offsets of the start of the packets, as returned by "find_packet_index".
+
+    Returns
+    -------
+    packets : packet_array
+        The decoded packets.
+    """
+    raw_bytes = np.frombuffer(raw, dtype=np.uint8)
+
+    def read_word(offset, n_bytes, dtype):
+        # Read the big-endian word at "offset" bytes from the start of each packet
+        word = np.zeros(len(packet_index), dtype=dtype)
+        for ii in range(n_bytes):
+            word = (word << 8) | raw_bytes[packet_index + offset + ii]
+        return word
+
+    time_word = read_word(4, 4, np.uint32)
+
+    return packet_array(
+        time_stamp=time_word & 0x3fffffff,          # mask for getting all timestamp bits
+        is_commanded=(time_word & 0x40000000) != 0,  # mask to test for commanded event type
+        is_hk=(time_word & 0x80000000) != 0,         # mask to test for housekeeping packets
+        channel1=read_word(8, 2, np.uint16),
+        channel2=read_word(10, 2, np.uint16),
+        channel3=read_word(12, 2, np.uint16),
+        channel4=read_word(14, 2, np.uint16),
+    )
+
+
+class packet_stream_decoder():
+    """
+    Class for decoding raw data which arrives in pieces, for example when a file is read in chunks.
+    The bytes after the last complete packet of a piece (a partial packet or a partial sync word)
+    are carried over and decoded together with the next piece, so the packets are the same as if
+    all the data had been decoded in one go.
+
+    Attributes:
+        carry: bytes
+            The bytes which have not been decoded yet.
+        n_bytes_done: int
+            The number of bytes of the stream before "carry", i.e. the ones which have already been
+            decoded.
+    """
+
+    def __init__(self):
+        self.carry = b""
+        self.n_bytes_done = 0
+
+    def feed(self, data=None):
+        """
+        Decodes the packets which are complete once "data" is added to the carried over bytes.
+
+        Parameters
+        ----------
+        data : bytes or bytes-like
+            The next piece of the raw data.
+
+        Returns
+        -------
+        packets : packet_array
+            The decoded packets.
+        """
+        raw = self.carry + bytes(data)
+        packet_index = find_packet_index(raw)
+        packets = gather_packets(raw=raw, packet_index=packet_index)
+
+        self.n_bytes_done += self.carry_over(raw=raw, packet_index=packet_index)
+
+        return packets
+
+    def carry_over(self, raw=None, packet_index=None):
+        """
+        Keeps the bytes of the raw data which have not been decoded yet. The search continues after
+        the last packet, or after the last position which has been searched for the sync word,
+        whichever comes later.
+
+        Parameters
+        ----------
+        raw : bytes or bytes-like
+            The raw data which has been searched.
+        packet_index : numpy.ndarray
+            Byte offsets in "raw" of the packets which have been found.
+
+        Returns
+        -------
+        n_searched : int
+            Number of bytes of "raw" before the carried over bytes.
+        """
+        n_searched = max(len(raw) - packet_size, 0)
+        if len(packet_index) > 0:
+            n_searched = max(packet_index[-1] + packet_size, n_searched)
+
+        self.carry = bytes(raw[n_searched:])
+
+        return n_searched
+
+    def seek(self, in_file_name=None, n_bytes=None, tail_size=2 ** 20):
+        """
+        Sets the decoder to the state it would have after being fed the first "n_bytes" bytes of a
+        file, without decoding them, for example because they have already been decoded in one go.
+        Only the last "tail_size" bytes are searched for the packets: a sync word which is at least
+        one packet after the previous sync word always starts a packet, so the packets after it are
+        the same as the ones found in the whole file.
+
+        Parameters
+        ----------
+        in_file_name : str
+            Name of the file. Default is None.
+        n_bytes : int
+            Number of bytes at the start of the file which are skipped. Default is None.
+        tail_size : int
+            Number of bytes searched for the packets. Default is 2 ** 20 (1 MB).
+
+        Returns
+        -------
+        is_found : bool
+            Whether the state of the decoder could be found. It can not if the file is shorter than
+            "n_bytes", or if none of the sync words in the searched bytes is one packet after the
+            previous one. The decoder is then not changed.
+        """
+        tail_start = max(n_bytes - tail_size, 0)
+        with open(in_file_name, 'rb') as file:
+            file.seek(tail_start)
+            raw = file.read(n_bytes - tail_start)
+        if len(raw) != n_bytes - tail_start:
+            return False
+
+        if tail_start == 0:
+            packet_index = find_packet_index(raw)
+        else:
+            candidates = find_sync_words(raw=raw, n_search=max(len(raw) - packet_size, 0))
+            # The sync words before the searched bytes are at least one byte before them
+            is_packet = np.diff(candidates, prepend=-1) >= packet_size
+            if len(candidates) > 0:
+                if not is_packet.any():
+                    return False
+                candidates = candidates[np.argmax(is_packet):]
+            packet_index = select_packet_starts(candidates)
+
+        self.n_bytes_done = tail_start + self.carry_over(raw=raw, packet_index=packet_index)
+
+        return True
+
+
+def sci_columns(packets=None):
+    """
+    Computes the science columns from the decoded packets. The values are the same as the ones
+    from "sci_packet.from_bytes", with the timestamp converted to seconds.
+
+    Parameters
+    ----------
+    packets : packet_array
+        The science packets.
+
+    Returns
+    -------
+    sci_cols : dict
+        Dictionary with the column name as key and the column array as value.
+    """
+    return {
+        "TimeStamp": packets.time_stamp / 1e3,
+        "IsCommanded": packets.is_commanded,
+        "Channel1": packets.channel1 * volts_per_count,
+        "Channel2": packets.channel2 * volts_per_count,
+        "Channel3": packets.channel3 * volts_per_count,
+        "Channel4": packets.channel4 * volts_per_count,
+    }
+
+
+def split_packets(packets=None):
+    """
+    Splits the decoded packets into science and housekeeping packets, based on the housekeeping bit
+    (0x80000000) of the time word.
+
+    Parameters
+    ----------
+    packets : packet_array
+        The packets, as returned by "decode_packets".
+
+    Returns
+    -------
+    sci_packets : packet_array
+        The science packets.
+    hk_packets : packet_array
+        The housekeeping packets.
+    """
+    return packets[~packets.is_hk], packets[packets.is_hk]
+
+
+def hk_columns(packets=None):
+    """
+    Computes the housekeeping columns from the decoded housekeeping packets. The values are the
+    same as the ones from "hk_packet_cls.from_bytes".
+
+    Parameters
+    ----------
+    packets : packet_array
+        The housekeeping packets, as returned by "split_packets".
+
+    Returns
+    -------
+    hk_cols : dict
+        Dictionary with the column name as key and the column array as value.
+    """
+    return {
+        "TimeStamp": packets.time_stamp / 1e3,
+        "HK_id": packets.hk_id(),
+        "hk_value": packets.hk_value(),
+        "DeltaEvntCount": packets.channel2,
+        "DeltaDroppedCount": packets.channel3,
+        "DeltaLostEvntCount": packets.channel4,
+    }
+
+
 def read_binary_data_sci(
     in_file_name=None,
     save_file_name="../data/processed/sci/output_sci.csv",
-    number_of_decimals=6
+    number_of_decimals=6,
+    use_mmap=False,
+    save_file=True,
+    save_format="csv",
+    keep_counts=False
 ):
     """
     Reads science packet of the binary data from a file and saves it to a csv file.
@@ -137,6 +946,16 @@ def read_binary_data_sci(
         Name of the output file. Default is "output_sci.csv".
     number_of_decimals : int
         Number of decimals to save. Default is 6.
+    use_mmap : bool
+        Whether to memory-map the input file instead of reading it in memory. Default is False.
+    save_file : bool
+        Whether to save the data to a file. Default is True.
+    save_format : str
+        Format of the saved file, one of "save_formats". Default is "csv".
+    keep_counts : bool
+        Whether to keep the channels as the raw 16-bit ADC counts, in the uint16 columns "Count1"
+        to "Count4", instead of the voltages in "Channel1" to "Channel4". The voltages can then be
+        computed when they are needed with "channel_volts". Default is False.
 
     Raises
     ------
@@ -172,70 +991,21 @@ def read_binary_data_sci(
             "The number of decimals to save must be an integer."
         )
 
-    input_file_name = in_file_name
-
-    with open(input_file_name, 'rb') as file:
-        raw = file.read()
-
-    index = 0
-    packets = []
-
-    while index < len(raw) - 16:
-        if raw[index:index + 4] == sync:
-            packets.append(sci_packet.from_bytes(raw[index:index + 16]))
-            index += 16
-            continue
-
-        index += 1
-
-    # Split the file name in a folder and a file name
-    output_file_name = in_file_name.split("/")[-1].split(".")[0] + "_sci_output.csv"
-    output_folder_name = "/".join(in_file_name.split("/")[:-2]) + "/processed_data/sci"
-
-    save_file_name = output_folder_name + "/" + output_file_name
-
-    # Check if the save folder exists, if not then create it
-    if not Path(output_folder_name).exists():
-        Path(output_folder_name).mkdir(parents=True, exist_ok=True)
-
-    with open(save_file_name, 'w', newline='') as file:
-        dict_writer = csv.DictWriter(
-            file,
-            fieldnames=(
-                'TimeStamp',
-                'IsCommanded',
-                'Channel1',
-                'Channel2',
-                'Channel3',
-                'Channel4'
-            ),
-        )
-        dict_writer.writeheader()
-        dict_writer.writerows(
-            {
-                'TimeStamp': sci_packet.timestamp / 1e3,
-                'IsCommanded': sci_packet.is_commanded,
-                'Channel1': np.round(sci_packet.channel1, decimals=number_of_decimals),
-                'Channel2': np.round(sci_packet.channel2, decimals=number_of_decimals),
-                'Channel3': np.round(sci_packet.channel3, decimals=number_of_decimals),
-                'Channel4': np.round(sci_packet.channel4, decimals=number_of_decimals)
-            }
-            for sci_packet in packets
-        )
-
-    # Read the saved file data in a dataframe
-    df = pd.read_csv(save_file_name)
+    sci_packets, _ = split_packets(decode_file(in_file_name=in_file_name, use_mmap=use_mmap))
 
-    # Save the dataframe to a csv file and set index to time stamp
-    df.to_csv(save_file_name, index=True)
-
-    return df, save_file_name
+    return process_sci_packets(packets=sci_packets, in_file_name=in_file_name,
+                               number_of_decimals=number_of_decimals, save_file=save_file,
+                               save_format=save_format, keep_counts=keep_counts)
 
 
 def read_binary_data_hk(
     in_file_name=None,
     save_file_name="../data/processed/hk/output_hk.csv",
-    number_of_decimals=6
+    number_of_decimals=6,
+    use_mmap=False,
+    fill_nan=True,
+    save_file=True,
+    save_format="csv"
 ):
     """
     Reads housekeeping packet of the binary data from a file and saves it to a csv file.
@@ -248,6 +1018,14 @@ def read_binary_data_hk(
         Name of the output file. Default is "output_hk.csv".
     number_of_decimals : int
         Number of decimals to save. Default is 6.
+    use_mmap : bool
+        Whether to memory-map the input file instead of reading it in memory. Default is False.
+    fill_nan : bool
+        Whether to fill the NaNs in each column with the previous value. Default is True.
+    save_file : bool
+        Whether to save the data to a file. Default is True.
+    save_format : str
+        Format of the saved file, one of "save_formats". Default is "csv".
 
     Raises
     ------
@@ -290,335 +1068,1669 @@ def read_binary_data_hk(
             "The number of decimals to save must be an integer."
         )
 
-    input_file_name = in_file_name
+    _, hk_packets = split_packets(decode_file(in_file_name=in_file_name, use_mmap=use_mmap))
 
-    with open(input_file_name, 'rb') as file:
-        raw = file.read()
+    return process_hk_packets(packets=hk_packets, in_file_name=in_file_name,
+                              number_of_decimals=number_of_decimals, fill_nan=fill_nan,
+                              save_file=save_file, save_format=save_format)
 
-    index = 0
-    packets = []
-
-    while index < len(raw) - 16:
-        if raw[index:index + 4] == sync:
-            packets.append(hk_packet_cls.from_bytes(raw[index:index + 16]))
-            index += 16
-            continue
 
-        index += 1
-
-    # Get only those packets that have the HK data
-    hk_idx = []
-    for idx, hk_packet in enumerate(packets):
-        if hk_packet is not None:
-            hk_idx.append(idx)
-
-    TimeStamp = np.full(len(hk_idx), np.nan)
-    HK_id = np.full(len(hk_idx), np.nan)
-    PinPullerTemp = np.full(len(hk_idx), np.nan)
-    OpticsTemp = np.full(len(hk_idx), np.nan)
-    LEXIbaseTemp = np.full(len(hk_idx), np.nan)
-    HVsupplyTemp = np.full(len(hk_idx), np.nan)
-    V_Imon_5_2 = np.full(len(hk_idx), np.nan)
-    V_Imon_10 = np.full(len(hk_idx), np.nan)
-    V_Imon_3_3 = np.full(len(hk_idx), np.nan)
-    AnodeVoltMon = np.full(len(hk_idx), np.nan)
-    V_Imon_28 = np.full(len(hk_idx), np.nan)
-    ADC_Ground = np.full(len(hk_idx), np.nan)
-    Cmd_count = np.full(len(hk_idx), np.nan)
-    Pinpuller_Armed = np.full(len(hk_idx), np.nan)
-    Unused1 = np.full(len(hk_idx), np.nan)
-    Unused2 = np.full(len(hk_idx), np.nan)
-    HVmcpAuto = np.full(len(hk_idx), np.nan)
-    HVmcpMan = np.full(len(hk_idx), np.nan)
-    DeltaEvntCount = np.full(len(hk_idx), np.nan)
-    DeltaDroppedCount = np.full(len(hk_idx), np.nan)
-    DeltaLostEvntCount = np.full(len(hk_idx), np.nan)
+def iter_binary_data(in_file_name=None, chunk_size=2 ** 26):
+    """
+    Reads the binary data from a file in chunks of fixed size, and yields the decoded science and
+    housekeeping columns of each chunk as soon as it is decoded. Only one chunk is in memory at a
+    time, so this can be used for files which are larger than the memory.
 
-    all_data_dict = {"TimeStamp": TimeStamp, "HK_id": HK_id,
-                     "0": PinPullerTemp, "1": OpticsTemp, "2": LEXIbaseTemp, "3": HVsupplyTemp,
-                     "4": V_Imon_5_2, "5": V_Imon_10, "6": V_Imon_3_3, "7": AnodeVoltMon,
-                     "8": V_Imon_28, "9": ADC_Ground, "10": Cmd_count, "11": Pinpuller_Armed,
-                     "12": Unused1, "13": Unused2, "14": HVmcpAuto, "15": HVmcpMan,
-                     "DeltaEvntCount": DeltaEvntCount, "DeltaDroppedCount": DeltaDroppedCount,
-                     "DeltaLostEvntCount": DeltaLostEvntCount}
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the input file. Default is None.
+    chunk_size : int
+        Number of bytes read from the file in one go. Default is 2 ** 26 (64 MB).
 
-    selected_keys = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14",
-                     "15"]
+    Raises
+    ------
+    FileNotFoundError :
+        If the input file does not exist or isn't specified.
+    TypeError :
+        If the name of the input file is not a string.
 
-    # Check if "unit_1" or "unit1" is in the file name, if so then the data is from the unit 1
-    if "unit_1" in input_file_name or "unit1" in input_file_name:
-        lxi_unit = 1
-    elif "unit_2" in input_file_name or "unit2" in input_file_name:
-        lxi_unit = 2
-    else:
-        # Print warning that unit is defaulted to 1
-        print(
-            "\n FileName Warning: \033[91m \nThe unit is defaulted to 1 because the name of the "
-            "file does not contain \"unit_1\" or \"unit1\" or \"unit_2\" or \"unit2\". \033[0m \n"
+    Yields
+    ------
+        sci_cols : dict
+            Science columns of the chunk, as returned by "sci_columns".
+        hk_cols : dict
+            Housekeeping columns of the chunk, as returned by "hk_columns".
+    """
+    if in_file_name is None:
+        raise FileNotFoundError(
+            "The input file name must be specified."
         )
-        lxi_unit = 1
 
-    for ii, idx in enumerate(hk_idx):
-        hk_packet = packets[idx]
-        # Convert to seconds from milliseconds for the timestamp
-        all_data_dict["TimeStamp"][ii] = hk_packet.timestamp / 1e3
-        all_data_dict["HK_id"][ii] = hk_packet.hk_id
-        key = str(hk_packet.hk_id)
-        if key in selected_keys:
-            all_data_dict[key][ii] = lmsc.hk_value_comp(ii=ii,
-                                                        vpc=volts_per_count,
-                                                        hk_value=hk_packet.hk_value,
-                                                        hk_id=hk_packet.hk_id,
-                                                        lxi_unit=lxi_unit
-                                                        )
-
-        all_data_dict["DeltaEvntCount"][ii] = hk_packet.delta_event_count
-        all_data_dict["DeltaDroppedCount"][ii] = hk_packet.delta_drop_event_count
-        all_data_dict["DeltaLostEvntCount"][ii] = hk_packet.delta_lost_event_count
+    # Check if the file exists, if does not exist raise an error
+    if not Path(in_file_name).is_file():
+        raise FileNotFoundError(
+            "The file " + in_file_name + " does not exist."
+        )
+    # Check if the file name and folder name are strings, if not then raise an error
+    if not isinstance(in_file_name, str):
+        raise TypeError(
+            "The file name must be a string."
+        )
+
+    decoder = packet_stream_decoder()
+    with open(in_file_name, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            packets = decoder.feed(chunk)
+            if len(packets) == 0:
+                continue
+            sci_packets, hk_packets = split_packets(packets)
+            yield sci_columns(sci_packets), hk_columns(hk_packets)
+
+
+def read_binary_data(
+    in_file_name=None,
+    number_of_decimals=6,
+    use_mmap=False,
+    n_workers=1,
+    fill_nan=True,
+    save_file=True,
+    save_format="csv",
+    keep_counts=False,
+    t_start=None,
+    t_end=None
+):
+    """
+    Reads both the science and the housekeeping packets of the binary data from a file and saves
+    them to csv files. The file is read and decoded only once, and each packet is then sent to
+    either the science or the housekeeping data based on its type.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the input file. Default is None.
+    number_of_decimals : int
+        Number of decimals to save. Default is 6.
+    use_mmap : bool
+        Whether to memory-map the input file instead of reading it in memory. Default is False.
+    n_workers : int
+        Number of processes used to decode the file. Default is 1.
+    fill_nan : bool
+        Whether to fill the NaNs in each housekeeping column with the previous value. Default is
+        True.
+    save_file : bool
+        Whether to save the science and housekeeping data to files. Default is True.
+    save_format : str
+        Format of the saved files, one of "save_formats". Default is "csv".
+    keep_counts : bool
+        Whether to keep the channels as the raw 16-bit ADC counts, in the uint16 columns "Count1"
+        to "Count4", instead of the voltages in "Channel1" to "Channel4". The voltages can then be
+        computed when they are needed with "channel_volts". Default is False.
+    t_start : float
+        Start time in seconds of the packets to read. If either "t_start" or "t_end" is given,
+        only the packets in the time window are decoded, with "decode_file_window", and the data
+        (and the saved files) only has these packets. Default is None.
+    t_end : float
+        End time in seconds of the packets to read. Default is None.
+
+    Raises
+    ------
+    FileNotFoundError :
+        If the input file does not exist or isn't specified.
+    TypeError :
+        If the name of the input file is not a string. Or if the number of decimals is not an
+        integer.
+
+    Returns
+    -------
+        df_sci : pandas.DataFrame
+            DataFrame of the science packets.
+        file_name_sci : str
+            Name of the science output file.
+        df_hk : pandas.DataFrame
+            DataFrame of the housekeeping packets.
+        file_name_hk : str
+            Name of the housekeeping output file.
+    """
+    if in_file_name is None:
+        raise FileNotFoundError(
+            "The input file name must be specified."
+        )
+
+    # Check if the file exists, if does not exist raise an error
+    if not Path(in_file_name).is_file():
+        raise FileNotFoundError(
+            "The file " + in_file_name + " does not exist."
+        )
+    # Check if the file name and folder name are strings, if not then raise an error
+    if not isinstance(in_file_name, str):
+        raise TypeError(
+            "The file name must be a string."
+        )
+
+    # Check the number of decimals to save
+    if not isinstance(number_of_decimals, int):
+        raise TypeError(
+            "The number of decimals to save must be an integer."
+        )
+
+    if t_start is not None or t_end is not None:
+        packets = decode_file_window(in_file_name=in_file_name, t_start=t_start, t_end=t_end)
+    else:
+        packets = decode_file(in_file_name=in_file_name, use_mmap=use_mmap, n_workers=n_workers)
+    sci_packets, hk_packets = split_packets(packets)
+
+    df_sci, file_name_sci = process_sci_packets(packets=sci_packets, in_file_name=in_file_name,
+                                                number_of_decimals=number_of_decimals,
+                                                save_file=save_file, save_format=save_format,
+                                                keep_counts=keep_counts)
+    df_hk, file_name_hk = process_hk_packets(packets=hk_packets, in_file_name=in_file_name,
+                                             number_of_decimals=number_of_decimals,
+                                             fill_nan=fill_nan, save_file=save_file,
+                                             save_format=save_format)
+
+    return df_sci, file_name_sci, df_hk, file_name_hk
+
+
+def process_sci_packets(packets=None, in_file_name=None, number_of_decimals=6, save_file=True,
+                        save_format="csv", keep_counts=False):
+    """
+    Computes the science data from the decoded science packets and, if "save_file" is True, saves
+    it to a file in the "processed_data/sci" folder next to the folder of the input file.
+
+    Parameters
+    ----------
+    packets : packet_array
+        The science packets.
+    in_file_name : str
+        Name of the input file, used to get the name of the output file. Default is None.
+    number_of_decimals : int
+        Number of decimals of the voltages. Default is 6.
+    save_file : bool
+        Whether to save the data to a file. Default is True.
+    save_format : str
+        Format of the saved file, one of "save_formats". Default is "csv".
+    keep_counts : bool
+        Whether to keep the channels as the raw 16-bit ADC counts, in the uint16 columns "Count1"
+        to "Count4", instead of the voltages in "Channel1" to "Channel4". The voltages can then be
+        computed when they are needed with "channel_volts". Default is False.
+
+    Returns
+    -------
+        df : pandas.DataFrame
+            DataFrame of the science packet.
+        save_file_name : str
+            Name of the output file, or None if the data was not saved.
+    """
+    if keep_counts:
+        sci_cols = {
+            "TimeStamp": packets.time_stamp / 1e3,
+            "IsCommanded": packets.is_commanded,
+            "Count1": packets.channel1,
+            "Count2": packets.channel2,
+            "Count3": packets.channel3,
+            "Count4": packets.channel4,
+        }
+    else:
+        sci_cols = sci_columns(packets)
+        for key in ["Channel1", "Channel2", "Channel3", "Channel4"]:
+            sci_cols[key] = np.round(sci_cols[key], decimals=number_of_decimals)
+
+    df = pd.DataFrame(sci_cols)
+
+    save_file_name = None
+    if save_file:
+        save_file_name = processed_file_name(in_file_name=in_file_name, file_type="sci",
+                                             save_format=save_format)
+        save_data(df=df, save_file_name=save_file_name)
+
+    return df, save_file_name
+
+
+def processed_file_name(in_file_name=None, file_type=None, save_format="csv"):
+    """
+    Gets the name of the processed file of a binary file. The processed files are saved in the
+    "processed_data/sci" or "processed_data/hk" folder next to the folder of the binary file.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the binary file. Default is None.
+    file_type : str
+        Type of the processed file, either "sci" or "hk". Default is None.
+    save_format : str
+        Format of the processed file, one of "save_formats". Default is "csv".
+
+    Returns
+    -------
+    save_file_name : str
+        Name of the processed file.
+    """
+    # Split the file name in a folder and a file name
+    output_file_name = (in_file_name.split("/")[-1].split(".")[0] +
+                        f"_{file_type}_output.{save_format}")
+    output_folder_name = "/".join(in_file_name.split("/")[:-2]) + f"/processed_data/{file_type}"
+
+    return output_folder_name + "/" + output_file_name
+
+
+def save_data(df=None, save_file_name=None):
+    """
+    Saves a science or housekeeping dataframe to a file. The format is chosen from the extension
+    of the file name:
+    - ".csv": text file with the index of the dataframe as the first column,
+    - ".npz": uncompressed numpy archive with one array per column,
+    - ".parquet" and ".feather": columnar files, which need the "pyarrow" package.
+    The binary formats keep the dtype of each column. The folder of the file is created if it does
+    not exist.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe to be saved, with "TimeStamp" as a column.
+    save_file_name : str
+        Name of the file. Default is None.
+
+    Raises
+    ------
+    ValueError :
+        If the extension of the file name is not one of "save_formats".
+
+    Returns
+    -------
+        None
+    """
+    save_format = Path(save_file_name).suffix.lower().lstrip(".")
+    if save_format not in save_formats:
+        raise ValueError(
+            f"The format of the file {save_file_name} must be one of {save_formats}."
+        )
+
+    # Check if the save folder exists, if not then create it
+    if not Path(save_file_name).parent.exists():
+        Path(save_file_name).parent.mkdir(parents=True, exist_ok=True)
+
+    if save_format == "csv":
+        df.to_csv(save_file_name, index=True)
+    elif save_format == "npz":
+        np.savez(save_file_name, **{key: df[key].to_numpy() for key in df.columns})
+    elif save_format == "parquet":
+        # Small row groups let "read_processed_file" skip the ones outside of a time window
+        df.to_parquet(save_file_name, index=False, row_group_size=2 ** 16)
+    elif save_format == "feather":
+        df.reset_index(drop=True).to_feather(save_file_name)
+
+
+def save_cached_data(in_file_name=None, df_sci=None, df_hk=None, save_format="csv",
+                     number_of_decimals=6):
+    """
+    Saves the science and housekeeping data of a binary file loaded from "raw_file_cache" to the
+    same processed files as "process_sci_packets" and "process_hk_packets". The science file only
+    has the decoded columns, with the float32 voltages converted back to the float64 ones with
+    "float64_volts". The rows are sorted by time.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the binary file. Default is None.
+    df_sci : pandas.DataFrame
+        The science dataframe, with "TimeStamp" as the index. Default is None.
+    df_hk : pandas.DataFrame
+        The housekeeping dataframe, with "TimeStamp" as the index and the float64 values of the
+        cache. Default is None.
+    save_format : str
+        Format of the saved files, one of "save_formats". Default is "csv".
+    number_of_decimals : int
+        Number of decimals of the voltages. Default is 6.
+
+    Returns
+    -------
+    file_name_sci : str
+        Name of the science file.
+    file_name_hk : str
+        Name of the housekeeping file.
+    """
+    sci_keys = ["IsCommanded", "Channel1", "Channel2", "Channel3", "Channel4", "Count1", "Count2",
+                "Count3", "Count4"]
+    df_sci = df_sci[[key for key in sci_keys if key in df_sci.columns]].reset_index()
+    for key in ["Channel1", "Channel2", "Channel3", "Channel4"]:
+        if key in df_sci.columns:
+            df_sci[key] = float64_volts(volts=df_sci[key], number_of_decimals=number_of_decimals)
+
+    file_name_sci = processed_file_name(in_file_name=in_file_name, file_type="sci",
+                                        save_format=save_format)
+    save_data(df=df_sci, save_file_name=file_name_sci)
+    file_name_hk = processed_file_name(in_file_name=in_file_name, file_type="hk",
+                                       save_format=save_format)
+    save_data(df=df_hk.reset_index(), save_file_name=file_name_hk)
+
+    return file_name_sci, file_name_hk
+
+
+def read_processed_file(file_val=None, t_start=None, t_end=None):
+    """
+    Reads a processed science or housekeeping file saved by "save_data", or any csv file with a
+    time column. The format is chosen from the extension of the file name.
+
+    If "t_start" or "t_end" is given, only the rows in the time window are kept, and as far as the
+    format allows only these rows are read:
+    - npz: the columns are memory-mapped, and the rows are found with a binary search of the time
+      column if it is sorted, so only the pages of the rows in the window are read,
+    - parquet: the row groups outside of the window are skipped using their statistics,
+    - feather: the whole file is read and then sliced,
+    - csv: the file is parsed in chunks and only the rows in the window of each chunk are kept, so
+      the memory used is proportional to the window, but the whole file is still parsed.
+
+    Parameters
+    ----------
+    file_val : str
+        Path to the input file. Default is None.
+    t_start : float
+        Start time of the rows to read. Default is None.
+    t_end : float
+        End time of the rows to read. Default is None.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The data in the file, with "TimeStamp" as the index. The rows are in the same order as in
+        the file.
+    """
+    read_window = t_start is not None or t_end is not None
+    if t_start is None:
+        t_start = -np.inf
+    if t_end is None:
+        t_end = np.inf
+
+    file_format = Path(file_val).suffix.lower()
+    if file_format == ".npz":
+        df = read_npz_window(file_val=file_val, t_start=t_start, t_end=t_end)
+    elif file_format == ".parquet":
+        filters = None
+        if read_window:
+            import pyarrow.parquet as pq
+            time_col = find_time_column(pq.read_schema(file_val).names)
+            filters = [(time_col, ">=", t_start), (time_col, "<=", t_end)]
+        df = pd.read_parquet(file_val, filters=filters)
+    elif file_format == ".feather":
+        df = pd.read_feather(file_val)
+    elif read_window:
+        df_list = []
+        for df_chunk in pd.read_csv(file_val, index_col=False, chunksize=2 ** 18):
+            time_col = find_time_column(df_chunk.keys())
+            df_list.append(df_chunk[(df_chunk[time_col] >= t_start) &
+                                    (df_chunk[time_col] <= t_end)])
+        df = pd.concat(df_list, ignore_index=True)
+    else:
+        df = pd.read_csv(file_val, index_col=False)
+
+    time_col = find_time_column(df.keys())
+    if read_window and file_format == ".feather":
+        df = df[(df[time_col] >= t_start) & (df[time_col] <= t_end)]
+
+    # Rename the time column to TimeStamp
+    df.rename(columns={time_col: 'TimeStamp'}, inplace=True)
+    # Set the index to the time column
+    df.set_index('TimeStamp', inplace=True)
+
+    return df
+
+
+def find_time_column(keys=None):
+    """
+    Finds the time column of a processed file, which is the first column with the word "time" in
+    its name.
+
+    Parameters
+    ----------
+    keys : list
+        Names of the columns. Default is None.
+
+    Returns
+    -------
+    time_col : str
+        Name of the time column.
+    """
+    # Check all the keys and find out which one has the word "time" in it
+    for key in keys:
+        if "time" in key.lower():
+            return key
+
+
+def npz_member_memmap(file_val=None, key=None):
+    """
+    Memory-maps one array of an uncompressed npz file, such as the ones saved by "save_data". The
+    array is read from the disk only when its values are used.
+
+    Parameters
+    ----------
+    file_val : str
+        Path to the npz file. Default is None.
+    key : str
+        Name of the array. Default is None.
+
+    Returns
+    -------
+    array : numpy.memmap
+        The memory-mapped array, or None if the array is compressed and can not be memory-mapped.
+    """
+    with zipfile.ZipFile(file_val) as zip_file:
+        info = zip_file.getinfo(f"{key}.npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(file_val, 'rb') as file:
+        # The data of a member starts after its local header, which has the name and extra fields
+        file.seek(info.header_offset + 26)
+        name_length, extra_length = struct.unpack("<HH", file.read(4))
+        file.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(file)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+        offset = file.tell()
+
+    if dtype.hasobject or len(shape) != 1 or shape[0] == 0:
+        return None
+
+    return np.memmap(file_val, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def read_npz_window(file_val=None, t_start=-np.inf, t_end=np.inf):
+    """
+    Reads the rows of an npz file saved by "save_data" with a time between "t_start" and "t_end".
+    The columns are memory-mapped with "npz_member_memmap", so only the rows in the window are
+    copied in memory. If the time column is sorted, the window is found with a binary search.
+
+    Parameters
+    ----------
+    file_val : str
+        Path to the npz file. Default is None.
+    t_start : float
+        Start time of the rows to read. Default is -inf.
+    t_end : float
+        End time of the rows to read. Default is inf.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The rows in the time window, in the same order as in the file.
+    """
+    with np.load(file_val) as data:
+        keys = data.files
+        columns = {key: npz_member_memmap(file_val=file_val, key=key) for key in keys}
+        # Columns which can not be memory-mapped are read in full
+        for key in keys:
+            if columns[key] is None:
+                columns[key] = data[key]
+
+    time_col = find_time_column(keys)
+    time_stamp = columns[time_col]
+    if t_start == -np.inf and t_end == np.inf:
+        rows = slice(None)
+    elif is_sorted(time_stamp):
+        rows = slice(np.searchsorted(time_stamp, t_start, side="left"),
+                     np.searchsorted(time_stamp, t_end, side="right"))
+    else:
+        rows = np.concatenate([np.flatnonzero((time_stamp[ii:ii + 2 ** 20] >= t_start) &
+                                              (time_stamp[ii:ii + 2 ** 20] <= t_end)) + ii
+                               for ii in range(0, len(time_stamp), 2 ** 20)] +
+                              [np.empty(0, dtype=np.int64)])
+
+    return pd.DataFrame({key: np.array(columns[key][rows]) for key in keys})
+
+
+def is_sorted(values=None, chunk_size=2 ** 20):
+    """
+    Checks whether an array is sorted in increasing order, one chunk at a time so that no
+    temporary array of the size of the whole array is made.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The array. Default is None.
+    chunk_size : int
+        Number of values checked in one go. Default is 2 ** 20.
+
+    Returns
+    -------
+    is_sorted : bool
+        Whether the array is sorted.
+    """
+    for ii in range(0, len(values), chunk_size):
+        # Each chunk overlaps the previous one by one value
+        chunk = values[max(ii - 1, 0):ii + chunk_size]
+        if np.any(chunk[1:] < chunk[:-1]):
+            return False
+
+    return True
+
+
+def processed_file_time_range(file_val=None):
+    """
+    Finds the first and the last time of a processed file, reading only its time column.
+
+    Parameters
+    ----------
+    file_val : str
+        Path to the processed file. Default is None.
+
+    Returns
+    -------
+    t_min : float
+        The first time in the file, or None if the file has no rows.
+    t_max : float
+        The last time in the file, or None if the file has no rows.
+    """
+    file_format = Path(file_val).suffix.lower()
+    if file_format == ".npz":
+        with np.load(file_val) as data:
+            time_col = find_time_column(data.files)
+            time_stamp = npz_member_memmap(file_val=file_val, key=time_col)
+            if time_stamp is None:
+                time_stamp = data[time_col]
+    elif file_format == ".parquet":
+        import pyarrow.parquet as pq
+        time_col = find_time_column(pq.read_schema(file_val).names)
+        time_stamp = pd.read_parquet(file_val, columns=[time_col])[time_col].to_numpy()
+    elif file_format == ".feather":
+        import pyarrow.ipc as ipc
+        time_col = find_time_column(ipc.open_file(file_val).schema.names)
+        time_stamp = pd.read_feather(file_val, columns=[time_col])[time_col].to_numpy()
+    else:
+        time_col = find_time_column(pd.read_csv(file_val, index_col=False, nrows=0).keys())
+        time_stamp = pd.read_csv(file_val, index_col=False, usecols=[time_col])[time_col]
+        time_stamp = time_stamp.to_numpy()
+
+    if len(time_stamp) == 0:
+        return None, None
+
+    return float(np.nanmin(time_stamp)), float(np.nanmax(time_stamp))
+
+
+def process_hk_packets(packets=None, in_file_name=None, number_of_decimals=6, fill_nan=True,
+                       save_file=True, save_format="csv", lxi_unit=None):
+    """
+    Computes the housekeeping data from the decoded housekeeping packets and, if "save_file" is
+    True, saves it to a file in the "processed_data/hk" folder next to the folder of the input
+    file.
+
+    Parameters
+    ----------
+    packets : packet_array
+        The housekeeping packets.
+    in_file_name : str
+        Name of the input file, used to get the name of the output file and the LEXI unit. Default
+        is None.
+    number_of_decimals : int
+        Number of decimals to save. Default is 6.
+    fill_nan : bool
+        Whether to fill the columns of each "hk_id" with the last value of that "hk_id". If False,
+        each column only has a value in the rows of its own "hk_id" and NaN everywhere else.
+        Default is True.
+    save_file : bool
+        Whether to save the data to a file. Default is True.
+    save_format : str
+        Format of the saved file, one of "save_formats". Default is "csv".
+    lxi_unit : int
+        The LEXI unit of the data, 1 or 2. Default is None, in which case it is found from the name
+        of the input file.
+
+    Returns
+    -------
+        df : pandas.DataFrame
+            DataFrame of the housekeeping packet.
+        save_file_name : str
+            Name of the output file, or None if the data was not saved.
+    """
+    hk_cols = hk_columns(packets)
+    n_hk = len(hk_cols["TimeStamp"])
+
+    TimeStamp = np.full(n_hk, np.nan)
+    HK_id = np.full(n_hk, np.nan)
+    PinPullerTemp = np.full(n_hk, np.nan)
+    OpticsTemp = np.full(n_hk, np.nan)
+    LEXIbaseTemp = np.full(n_hk, np.nan)
+    HVsupplyTemp = np.full(n_hk, np.nan)
+    V_Imon_5_2 = np.full(n_hk, np.nan)
+    V_Imon_10 = np.full(n_hk, np.nan)
+    V_Imon_3_3 = np.full(n_hk, np.nan)
+    AnodeVoltMon = np.full(n_hk, np.nan)
+    V_Imon_28 = np.full(n_hk, np.nan)
+    ADC_Ground = np.full(n_hk, np.nan)
+    Cmd_count = np.full(n_hk, np.nan)
+    Pinpuller_Armed = np.full(n_hk, np.nan)
+    Unused1 = np.full(n_hk, np.nan)
+    Unused2 = np.full(n_hk, np.nan)
+    HVmcpAuto = np.full(n_hk, np.nan)
+    HVmcpMan = np.full(n_hk, np.nan)
+    DeltaEvntCount = np.full(n_hk, np.nan)
+    DeltaDroppedCount = np.full(n_hk, np.nan)
+    DeltaLostEvntCount = np.full(n_hk, np.nan)
+
+    all_data_dict = {"TimeStamp": TimeStamp, "HK_id": HK_id,
+                     "0": PinPullerTemp, "1": OpticsTemp, "2": LEXIbaseTemp, "3": HVsupplyTemp,
+                     "4": V_Imon_5_2, "5": V_Imon_10, "6": V_Imon_3_3, "7": AnodeVoltMon,
+                     "8": V_Imon_28, "9": ADC_Ground, "10": Cmd_count, "11": Pinpuller_Armed,
+                     "12": Unused1, "13": Unused2, "14": HVmcpAuto, "15": HVmcpMan,
+                     "DeltaEvntCount": DeltaEvntCount, "DeltaDroppedCount": DeltaDroppedCount,
+                     "DeltaLostEvntCount": DeltaLostEvntCount}
+
+    selected_keys = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "13", "14",
+                     "15"]
+
+    # Check if "unit_1" or "unit1" is in the file name, if so then the data is from the unit 1
+    if lxi_unit is not None:
+        pass
+    elif "unit_1" in in_file_name or "unit1" in in_file_name:
+        lxi_unit = 1
+    elif "unit_2" in in_file_name or "unit2" in in_file_name:
+        lxi_unit = 2
+    else:
+        # Print warning that unit is defaulted to 1
+        print(
+            "\n FileName Warning: \033[91m \nThe unit is defaulted to 1 because the name of the "
+            "file does not contain \"unit_1\" or \"unit1\" or \"unit_2\" or \"unit2\". \033[0m \n"
+        )
+        lxi_unit = 1
+
+    all_data_dict["TimeStamp"][:] = hk_cols["TimeStamp"]
+    all_data_dict["HK_id"][:] = hk_cols["HK_id"]
+
+    # Calibrate all the values at once, and then put each one in the column of its "hk_id"
+    hk_value_cal = lmsc.hk_value_comp_vec(vpc=volts_per_count, hk_value=hk_cols["hk_value"],
+                                          hk_id=hk_cols["HK_id"], lxi_unit=lxi_unit)
+    for key in selected_keys:
+        hk_id_mask = hk_cols["HK_id"] == int(key)
+        all_data_dict[key][hk_id_mask] = hk_value_cal[hk_id_mask]
+
+    all_data_dict["DeltaEvntCount"][:] = hk_cols["DeltaEvntCount"]
+    all_data_dict["DeltaDroppedCount"][:] = hk_cols["DeltaDroppedCount"]
+    all_data_dict["DeltaLostEvntCount"][:] = hk_cols["DeltaLostEvntCount"]
+
+    # Create a dataframe with the data
+    df_key_list = ["TimeStamp", "HK_id", "PinPullerTemp", "OpticsTemp", "LEXIbaseTemp",
+                   "HVsupplyTemp", "+5.2V_Imon", "+10V_Imon", "+3.3V_Imon", "AnodeVoltMon",
+                   "+28V_Imon", "ADC_Ground", "Cmd_count", "Pinpuller_Armed", "Unused1", "Unused2",
+                   "HVmcpAuto", "HVmcpMan", "DeltaEvntCount", "DeltaDroppedCount",
+                   "DeltaLostEvntCount"]
+
+    df = pd.DataFrame(columns=df_key_list)
+    for ii, key in enumerate(df_key_list):
+        df[key] = all_data_dict[list(all_data_dict.keys())[ii]]
+
+    # For the dataframe, replace the nans with the value from the previous index.
+    # This is to make sure that the file isn't inundated with nans.
+    if fill_nan:
+        df = df.ffill()
+
+    # Set the index to the TimeStamp
+    df.set_index("TimeStamp", inplace=False)
+
+    save_file_name = None
+    if save_file:
+        save_file_name = processed_file_name(in_file_name=in_file_name, file_type="hk",
+                                             save_format=save_format)
+        save_data(df=df, save_file_name=save_file_name)
+
+    return df, save_file_name
+
+
+def open_file_sci(start_time=None, end_time=None):
+    # define a global variable for the file name
+
+    file_val = filedialog.askopenfilename(initialdir="../data/processed_data/sci/",
+                                          title="Select file",
+                                          filetypes=(("csv files", "*.csv"),
+                                                     ("npz files", "*.npz"),
+                                                     ("parquet files", "*.parquet"),
+                                                     ("feather files", "*.feather"),
+                                                     ("all files", "*.*"))
+                                          )
+    # Cut path to the file off
+    file_name_sci = file_val.split('/')[-1]
+    global_variables.all_file_details['file_name_sci'] = file_val
+
+    df_all_sci, _ = read_csv_sci(file_val=file_val, t_start=start_time, t_end=end_time)
+    set_loaded_data(file_type="sci", df_all=df_all_sci, t_start=start_time, t_end=end_time)
+    print(f"\n \x1b[1;32;255m Loaded {file_name_sci} in the data base \x1b[0m")
+
+    return file_val
+
+
+def open_file_hk():
+    # define a global variable for the file name
+    file_val = filedialog.askopenfilename(initialdir="../data/processed_data/hk/",
+                                          title="Select file",
+                                          filetypes=(("csv files", "*.csv"),
+                                                     ("npz files", "*.npz"),
+                                                     ("parquet files", "*.parquet"),
+                                                     ("feather files", "*.feather"),
+                                                     ("all files", "*.*"))
+                                          )
+    # Cut path to the file off
+    file_name_hk = file_val.split('/')[-1]
+    global_variables.all_file_details['file_name_hk'] = file_val
+
+    df_all_hk, _ = read_csv_hk(file_val)
+    set_loaded_data(file_type="hk", df_all=df_all_hk)
+    print(f"\n \x1b[1;32;255m Loaded {file_name_hk} in the data base \x1b[0m")
+    return file_val
+
+
+def open_file_b(save_file=False):
+    # define a global variable for the file name
+    file_val = filedialog.askopenfilename(initialdir="../data/raw_data/",
+                                          title="Select file",
+                                          filetypes=(("text files", "*.txt"),
+                                                     ("all files", "*.*"))
+                                          )
+
+    # Cut path to the file off
+    file_name_b = file_val
+    # The size of the file before it is read, to follow the bytes added to it afterwards
+    file_size = Path(file_val).stat().st_size
+    # The decoded data is only saved to files if "save_file" is True, also when it is loaded from
+    # the cache
+    (_, file_name_hk, _, file_name_sci, df_all_hk, df_all_sci
+     ) = read_binary_file(file_val, save_file=save_file, use_cache=True)
+    global_variables.all_file_details["file_name_b"] = file_name_b
+    # The data which was not saved to files comes from the binary file
+    global_variables.all_file_details["file_name_hk"] = file_name_hk or file_name_b
+    global_variables.all_file_details["file_name_sci"] = file_name_sci or file_name_b
+
+    # As in "read_binary_file", the housekeeping data is selected over the time range of the
+    # science data
+    set_loaded_data(file_type="hk", df_all=df_all_hk, t_start=df_all_sci.index.min(),
+                    t_end=df_all_sci.index.max())
+    set_loaded_data(file_type="sci", df_all=df_all_sci)
+    # "update_file_b" then only decodes the bytes added to the file after the loaded ones
+    global_variables.all_file_details["file_follower"] = create_file_follower(
+        file_name_b=file_name_b, n_bytes=file_size)
+
+    if file_name_sci is None:
+        print(f"\n Loaded \x1b[1;32;255m{file_name_b}\x1b[0m in the data base")
+    else:
+        print(
+            f"\n Loaded \x1b[1;32;255m{file_name_b}\x1b[0m in the data base,\n  and the csv file "
+            f"for \x1b[1;32;255m HK \x1b[0m and \x1b[1;32;255m SCI \x1b[0m data have been saved "
+            f"to \n HK File : \x1b[1;32;255m{file_name_hk} \x1b[0m \n and \n Sci File: "
+            f"\x1b[1;32;255m{file_name_sci}\x1b[0m")
+
+    return file_val
+
+
+def set_loaded_data(file_type=None, df_all=None, t_start=None, t_end=None):
+    """
+    Puts a science or housekeeping dataframe in the data store of the session,
+    "global_variables.all_file_details["data_store"]", which keeps the only copy of the data. The
+    whole dataframe is then "df_all_<file_type>" and the rows between "t_start" and "t_end" are
+    "df_slice_<file_type>", which is a view of the whole dataframe.
+
+    Parameters
+    ----------
+    file_type : str
+        Type of the data, either "sci" or "hk". Default is None.
+    df_all : pandas.DataFrame
+        The whole dataframe, with "TimeStamp" as the index. Default is None.
+    t_start : float
+        Start time of the selected data. Default is None.
+    t_end : float
+        End time of the selected data. Default is None.
+
+    Returns
+    -------
+        None
+    """
+    store = global_variables.all_file_details.setdefault("data_store", lxds.data_store())
+    global_variables.all_file_details[f"df_all_{file_type}"] = store.set_frame(name=file_type,
+                                                                               df=df_all)
+    global_variables.all_file_details[f"df_slice_{file_type}"] = store.view(name=file_type,
+                                                                            t_start=t_start,
+                                                                            t_end=t_end)
+
+
+def loaded_data_version(file_type=None):
+    """
+    Gets the version of the science or housekeeping data in the data store of the session, which
+    changes every time the data is loaded or updated.
+
+    Parameters
+    ----------
+    file_type : str
+        Type of the data, either "sci" or "hk". Default is None.
+
+    Returns
+    -------
+    version : int
+        The version, or None if no data has been loaded.
+    """
+    store = global_variables.all_file_details.get("data_store")
+    if store is None:
+        return None
+
+    return store.version(name=file_type)
+
+
+def create_file_follower(file_name_b=None, n_bytes=None):
+    """
+    Creates the follower of the loaded binary file, which decodes the bytes added to the file after
+    the loaded ones. The follower is tied to the versions of the loaded science and housekeeping
+    data, so that it does not append rows to the data of another file.
+
+    Parameters
+    ----------
+    file_name_b : str
+        Name of the binary file. Default is None.
+    n_bytes : int
+        Size of the file when it was loaded. If the file still has this size, the follower starts
+        after the loaded bytes, see "binary_file_follower.skip_loaded_data". Otherwise, or if None,
+        its first update decodes the whole file again and skips the loaded rows. Default is None.
+
+    Returns
+    -------
+    follower : binary_file_follower
+        The follower of the file.
+    """
+    store = global_variables.all_file_details.setdefault("data_store", lxds.data_store())
+    for file_type in ["sci", "hk"]:
+        if store.frame(name=file_type) is None:
+            store.set_frame(name=file_type,
+                            df=global_variables.all_file_details[f"df_all_{file_type}"])
+    df_all_sci = store.frame(name="sci")
+    df_all_hk = store.frame(name="hk")
+
+    # Use the same offsets as the loaded data for the x and y-coordinates of the new rows
+    channel_offsets = df_all_sci.attrs.get("channel_offsets")
+    if channel_offsets is None:
+        channel_offsets = compute_channel_offsets(df=df_all_sci)
+    follower = binary_file_follower(in_file_name=file_name_b, number_of_decimals=6,
+                                    n_skip_sci=len(df_all_sci), n_skip_hk=len(df_all_hk),
+                                    channel_offsets=channel_offsets)
+    if n_bytes is not None and Path(file_name_b).stat().st_size == n_bytes:
+        follower.skip_loaded_data(n_bytes=n_bytes, df_hk=df_all_hk)
+    follower.data_versions = {file_type: store.version(name=file_type)
+                              for file_type in ["sci", "hk"]}
+
+    return follower
+
+
+def update_file_b():
+    """
+    Decodes the data which was added to the loaded binary file since it was loaded or last updated,
+    and appends it to the loaded science and housekeeping dataframes. Nothing is changed if no new
+    rows were added, or if other data has been loaded since the binary file.
+
+    Returns
+    -------
+    file_name_b : str
+        Name of the binary file, or None if the loaded data is not the one of a binary file.
+    """
+    file_name_b = global_variables.all_file_details.get("file_name_b")
+    if file_name_b is None:
+        print("\n \x1b[1;31;255m Load a binary file before updating it \x1b[0m")
+        return None
+
+    follower = global_variables.all_file_details.get("file_follower")
+    if follower is None or follower.in_file_name != file_name_b:
+        follower = create_file_follower(file_name_b=file_name_b)
+        global_variables.all_file_details["file_follower"] = follower
+
+    # The rows are only appended to the data of the followed file
+    store = global_variables.all_file_details["data_store"]
+    if any(store.version(name=file_type) != version
+           for file_type, version in follower.data_versions.items()):
+        print(f"\n \x1b[1;31;255m Other data has been loaded since {file_name_b}, load the "
+              f"binary file again before updating it \x1b[0m")
+        return None
+
+    df_new_sci, df_new_hk = follower.update()
+
+    for file_type, df_new in [("sci", df_new_sci), ("hk", df_new_hk)]:
+        # Without new rows the data, its selection and its version are left as they are
+        if len(df_new) == 0:
+            continue
+        df_all = store.append(name=file_type, df_new=df_new)
+        if file_type == "sci":
+            df_all.attrs["channel_offsets"] = follower.channel_offsets
+        global_variables.all_file_details[f"df_all_{file_type}"] = df_all
+        # "open_file_b" selects the whole file, so the updated selection is the whole file as well
+        global_variables.all_file_details[f"df_slice_{file_type}"] = df_all
+        follower.data_versions[file_type] = store.version(name=file_type)
+
+    print(f"\n Added \x1b[1;32;255m{len(df_new_sci)}\x1b[0m science and "
+          f"\x1b[1;32;255m{len(df_new_hk)}\x1b[0m housekeeping rows from "
+          f"\x1b[1;32;255m{file_name_b}\x1b[0m")
+
+    return file_name_b
+
+
+def compute_position(v1=None, v2=None, n_bins=401, bin_min=0, bin_max=4, number_of_decimals=6):
+    """
+    The function computes the position of the particle in the xy-plane. The ratios to compute
+    both the x and y position are taken from Dennis' code. The code computes the offset of the
+    four voltages as measured by LEXI. We then subtract the offset from the four voltages to get
+    the shifted voltages and then compute the position of the particle based on the shifted
+    voltages.
+
+    Parameters
+    ----------
+    v1 : float or uint16
+        Voltage of the first channel, or its ADC counts. Default is None.
+    v2 : float or uint16
+        Voltage of the second channel, or its ADC counts. Default is None.
+    n_bins : int
+        Number of bins to compute the position. Default is 401.
+    bin_min : float
+        Minimum value of the bin. Default is 0.
+    bin_max : float
+        Maximum value of the bin. Default is 4.
+    number_of_decimals : int
+        Number of decimals of the voltages computed from the ADC counts, if the counts are given.
+        Default is 6.
+
+    Returns
+    -------
+    particle_pos : float
+        position of the particle along one of the axis. Whether it gives x or y position depends
+        on which voltages were provided. For example, if v1 and v3 were provided, then the x
+        position is returned. Else if v4 and v2 were provided, then the y position is returned.
+        It is important to note that the order of the voltages is important.
+    v1_shift: float
+        Offset corrected voltage of the first channel.
+    v2_shift: float
+        Offset corrected voltage of the second channel.
+    """
+    n1_z = compute_channel_offset(v=v1, n_bins=n_bins, bin_min=bin_min, bin_max=bin_max,
+                                  number_of_decimals=number_of_decimals)
+    n2_z = compute_channel_offset(v=v2, n_bins=n_bins, bin_min=bin_min, bin_max=bin_max,
+                                  number_of_decimals=number_of_decimals)
+
+    # The ADC counts are converted to voltages only now, once their offsets are known
+    if np.issubdtype(np.asarray(v1).dtype, np.integer):
+        v1 = counts_to_volts(v1, number_of_decimals=number_of_decimals)
+    if np.issubdtype(np.asarray(v2).dtype, np.integer):
+        v2 = counts_to_volts(v2, number_of_decimals=number_of_decimals)
+
+    v1_shift = v1 - n1_z
+    v2_shift = v2 - n2_z
+
+    particle_pos = v2_shift / (v2_shift + v1_shift)
+
+    return particle_pos, v1_shift, v2_shift
+
+
+def compute_channel_offset(v=None, n_bins=401, bin_min=0, bin_max=4, number_of_decimals=6):
+    """
+    Computes the offset of the voltage of one channel, which is the left edge of the most populated
+    bin in the lower half of the histogram of the voltage. If the ADC counts of the channel are
+    given instead of the voltage, the histogram is computed with "histogram_counts", which gives
+    the same histogram as the one of the voltages from "counts_to_volts".
+
+    Parameters
+    ----------
+    v : float or uint16
+        Voltage or ADC counts of the channel. Default is None.
+    n_bins : int
+        Number of bins of the histogram. Default is 401.
+    bin_min : float
+        Minimum value of the bin. Default is 0.
+    bin_max : float
+        Maximum value of the bin. Default is 4.
+    number_of_decimals : int
+        Number of decimals of the voltages, only used for the ADC counts. Default is 6.
+
+    Returns
+    -------
+    offset : float
+        Offset of the voltage of the channel.
+    """
+    # make 1-D histogram of the channel
+    hist_v = channel_histogram(v=v, n_bins=n_bins, bin_min=bin_min, bin_max=bin_max,
+                               number_of_decimals=number_of_decimals)
+
+    return histogram_offset(hist_v=hist_v, n_bins=n_bins, bin_min=bin_min, bin_max=bin_max)
+
+
+def histogram_offset(hist_v=None, n_bins=401, bin_min=0, bin_max=4):
+    """
+    Finds the offset of a channel from the histogram of its voltage, as the left edge of the most
+    populated bin in the lower half of the histogram.
+
+    Parameters
+    ----------
+    hist_v : numpy.ndarray
+        Histogram of the voltage of the channel. Default is None.
+    n_bins : int
+        Number of bins of the histogram. Default is 401.
+    bin_min : float
+        Minimum value of the bin. Default is 0.
+    bin_max : float
+        Maximum value of the bin. Default is 4.
+
+    Returns
+    -------
+    offset : float
+        Offset of the voltage of the channel.
+    """
+    bin_size = (bin_max - bin_min) / (n_bins - 1)
+    xx = bin_min + bin_size * np.arange(n_bins)
+
+    # Find the index where the histogram is the maximum
+    # NOTE/TODO: I don't quite understand why the offset is computed this way. Need to talk to
+    # Dennis about this and get an engineering/physics reason for it.
+    max_index = np.argmax(hist_v[0:int(n_bins / 2)])
+
+    z_min = 1000 * xx[max_index]
+
+    return z_min / 1000
+
+
+def compute_positions(v1=None, v2=None, v3=None, v4=None, channel_offsets=None, n_bins=401,
+                      bin_min=0, bin_max=4, number_of_decimals=6, chunk_size=2 ** 20):
+    """
+    Computes the x and y-coordinates of the particles and the shifts of the voltages of the four
+    channels in one go, the same way as "compute_position" does for each pair of channels:
+    x = v3_shift / (v1_shift + v3_shift) and y = v2_shift / (v2_shift + v4_shift).
+
+    The data is read in chunks of "chunk_size" rows. The histograms for the offsets of the four
+    channels are filled in a first pass with "channel_histogram", which bins both the ADC counts
+    and the decoded voltages with an integer bincount. The coordinates and shifts are then written
+    in a second pass into arrays which are allocated once. So apart from the outputs, the memory
+    used does not depend on the number of events. The coordinates are NaN where their denominator
+    is 0.
+
+    Parameters
+    ----------
+    v1 : float or uint16
+        Voltage of the first channel, or its ADC counts. Default is None.
+    v2 : float or uint16
+        Voltage of the second channel, or its ADC counts. Default is None.
+    v3 : float or uint16
+        Voltage of the third channel, or its ADC counts. Default is None.
+    v4 : float or uint16
+        Voltage of the fourth channel, or its ADC counts. Default is None.
+    channel_offsets : dict
+        Offset of the voltage of each channel, from "Channel1" to "Channel4". Default is None, in
+        which case they are computed from the data.
+    n_bins : int
+        Number of bins of the histograms for the offsets. Default is 401.
+    bin_min : float
+        Minimum value of the bins. Default is 0.
+    bin_max : float
+        Maximum value of the bins. Default is 4.
+    number_of_decimals : int
+        Number of decimals of the voltages. Default is 6.
+    chunk_size : int
+        Number of rows computed in one go. Default is 2 ** 20.
+
+    Returns
+    -------
+    positions : dict
+        The float32 arrays "x_val", "y_val" and "v1_shift" to "v4_shift".
+    channel_offsets : dict
+        Offset of the voltage of each channel.
+    """
+    channels = {"Channel1": np.asarray(v1), "Channel2": np.asarray(v2),
+                "Channel3": np.asarray(v3), "Channel4": np.asarray(v4)}
+    n_rows = len(channels["Channel1"])
+
+    if channel_offsets is None:
+        hist_v = {key: np.zeros(n_bins, dtype=np.int64) for key in channels}
+        for ii in range(0, n_rows, chunk_size):
+            for key, v in channels.items():
+                hist_v[key] += channel_histogram(v=v[ii:ii + chunk_size], n_bins=n_bins,
+                                                 bin_min=bin_min, bin_max=bin_max,
+                                                 number_of_decimals=number_of_decimals)
+        channel_offsets = {key: histogram_offset(hist_v=hist_v[key], n_bins=n_bins,
+                                                 bin_min=bin_min, bin_max=bin_max)
+                           for key in channels}
+
+    positions = {key: np.empty(n_rows, dtype=np.float32)
+                 for key in ["x_val", "y_val", "v1_shift", "v2_shift", "v3_shift", "v4_shift"]}
+    for ii in range(0, n_rows, chunk_size):
+        shifts = []
+        for key, v in channels.items():
+            v_chunk = v[ii:ii + chunk_size]
+            if np.issubdtype(v_chunk.dtype, np.integer):
+                v_chunk = counts_to_volts(v_chunk, number_of_decimals=number_of_decimals)
+            else:
+                v_chunk = float64_volts(volts=v_chunk, number_of_decimals=number_of_decimals)
+            shifts.append(v_chunk - channel_offsets[key])
+        v1_shift, v2_shift, v3_shift, v4_shift = shifts
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for key, numerator, denominator in [("x_val", v3_shift, v3_shift + v1_shift),
+                                                ("y_val", v2_shift, v2_shift + v4_shift)]:
+                is_zero = denominator == 0
+                ratio = np.divide(numerator, denominator, out=denominator)
+                ratio[is_zero] = np.nan
+                positions[key][ii:ii + chunk_size] = ratio
+
+        for key, shift in zip(["v1_shift", "v2_shift", "v3_shift", "v4_shift"], shifts):
+            positions[key][ii:ii + chunk_size] = shift
+
+    return positions, channel_offsets
+
+
+def counts_to_volts(counts=None, number_of_decimals=None):
+    """
+    Converts the ADC counts of the channels to voltages.
+
+    Parameters
+    ----------
+    counts : uint16
+        ADC counts. Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages are rounded to. Default is None, which does not round them.
+
+    Returns
+    -------
+    volts : float
+        The voltages.
+    """
+    volts = counts * volts_per_count
+    if number_of_decimals is not None:
+        volts = np.round(volts, decimals=number_of_decimals)
+
+    return volts
+
+
+def float64_volts(volts=None, number_of_decimals=6):
+    """
+    Converts voltages to float64. The float32 voltages of the dataframes (see "sci_schema") are
+    rounded again to "number_of_decimals", which gives back exactly the float64 voltages they were
+    made from, so that they fall in the same histogram bins.
+
+    Parameters
+    ----------
+    volts : float
+        Voltages. Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages were rounded to. Default is 6.
+
+    Returns
+    -------
+    volts : float
+        The float64 voltages, or "volts" itself if they are not float32.
+    """
+    if np.asarray(volts).dtype != np.float32:
+        return volts
 
-    # Create a dataframe with the data
-    df_key_list = ["TimeStamp", "HK_id", "PinPullerTemp", "OpticsTemp", "LEXIbaseTemp",
-                   "HVsupplyTemp", "+5.2V_Imon", "+10V_Imon", "+3.3V_Imon", "AnodeVoltMon",
-                   "+28V_Imon", "ADC_Ground", "Cmd_count", "Pinpuller_Armed", "Unused1", "Unused2",
-                   "HVmcpAuto", "HVmcpMan", "DeltaEvntCount", "DeltaDroppedCount",
-                   "DeltaLostEvntCount"]
+    return np.round(volts.astype(np.float64), decimals=number_of_decimals)
 
-    df = pd.DataFrame(columns=df_key_list)
-    for ii, key in enumerate(df_key_list):
-        df[key] = all_data_dict[list(all_data_dict.keys())[ii]]
 
-    # For the dataframe, replace the nans with the value from the previous index.
-    # This is to make sure that the file isn't inundated with nans.
-    for key in df.keys():
-        for ii in range(1, len(df[key])):
-            if np.isnan(df[key][ii]):
-                df[key][ii] = df[key][ii - 1]
+def volts_to_counts(volts=None, number_of_decimals=6):
+    """
+    Converts the voltages of the channels, as computed by "counts_to_volts", back to the ADC counts.
 
-    # Set the index to the TimeStamp
-    df.set_index("TimeStamp", inplace=False)
+    Parameters
+    ----------
+    volts : float
+        Voltages. Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages were rounded to. Default is 6.
 
-    # Split the file name in a folder and a file name
-    output_file_name = in_file_name.split("/")[-1].split(".")[0] + "_hk_output.csv"
-    output_folder_name = "/".join(in_file_name.split("/")[:-2]) + "/processed_data/hk"
+    Returns
+    -------
+    counts : numpy.ndarray
+        The ADC counts (uint16), or None if some of the voltages are not the voltage of an ADC
+        count, for example if they are NaN or were computed in another way.
+    """
+    volts = np.asarray(volts)
+    if volts.dtype != np.float32:
+        volts = np.asarray(volts, dtype=float)
+    counts = np.rint(volts.astype(float) * (1 / volts_per_count))
+    if not np.all((counts >= 0) & (counts < 2 ** 16)):
+        return None
 
-    save_file_name = output_folder_name + "/" + output_file_name
+    # The voltages must be the ones of the counts, in the same precision
+    counts = counts.astype(np.uint16)
+    if not np.array_equal(count_volts(number_of_decimals=number_of_decimals,
+                                      dtype=volts.dtype)[counts], volts):
+        return None
 
-    # Check if the save folder exists, if not then create it
-    if not Path(output_folder_name).exists():
-        Path(output_folder_name).mkdir(parents=True, exist_ok=True)
+    return counts
 
-    # Save the dataframe to a csv file
-    df.to_csv(save_file_name, index=True)
 
-    return df, save_file_name
+@functools.lru_cache(maxsize=16)
+def count_volts(number_of_decimals=None, dtype=np.float64):
+    """
+    Gets the voltage of each of the 2 ** 16 ADC counts, as computed by "counts_to_volts".
 
-def open_file_sci(start_time=None, end_time=None):
-    # define a global variable for the file name
+    Parameters
+    ----------
+    number_of_decimals : int
+        Number of decimals the voltages are rounded to. Default is None.
+    dtype : numpy.dtype
+        Type of the voltages, for example float32 for the voltages of the dataframes (see
+        "sci_schema"). Default is float64.
 
-    file_val = filedialog.askopenfilename(initialdir="../data/processed_data/sci/",
-                                          title="Select file",
-                                          filetypes=(("csv files", "*.csv"),
-                                                     ("all files", "*.*"))
-                                          )
-    # Cut path to the file off
-    file_name_sci = file_val.split('/')[-1]
-    global_variables.all_file_details['file_name_sci'] = file_val
+    Returns
+    -------
+    volts : numpy.ndarray
+        The voltage of each ADC count.
+    """
+    volts = counts_to_volts(np.arange(2 ** 16),
+                            number_of_decimals=number_of_decimals).astype(dtype)
 
-    df_all_sci, df_slice_sci = read_csv_sci(file_val=file_val, t_start=start_time, t_end=end_time)
-    global_variables.all_file_details['df_slice_sci'] = df_slice_sci
-    global_variables.all_file_details['df_all_sci'] = df_all_sci
-    print(f"\n \x1b[1;32;255m Loaded {file_name_sci} in the data base \x1b[0m")
+    volts.flags.writeable = False
+    return volts
 
-    return file_val
 
+@functools.lru_cache(maxsize=64)
+def count_bin_index(n_bins=None, bin_min=None, bin_max=None, number_of_decimals=None):
+    """
+    Finds the histogram bin of the voltage of each of the 2 ** 16 ADC counts. The bins are the
+    same as the ones of "numpy.histogram" with "bins=n_bins" and "range=(bin_min, bin_max)".
 
-def open_file_hk():
-    # define a global variable for the file name
-    file_val = filedialog.askopenfilename(initialdir="../data/processed_data/hk/",
-                                          title="Select file",
-                                          filetypes=(("csv files", "*.csv"),
-                                                     ("all files", "*.*"))
-                                          )
-    # Cut path to the file off
-    file_name_hk = file_val.split('/')[-1]
-    global_variables.all_file_details['file_name_hk'] = file_val
+    Parameters
+    ----------
+    n_bins : int
+        Number of bins. Default is None.
+    bin_min : float
+        Left edge of the first bin. Default is None.
+    bin_max : float
+        Right edge of the last bin. Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages are rounded to. Default is None.
 
-    df_all_hk, df_slice_hk = read_csv_hk(file_val)
-    global_variables.all_file_details['df_slice_hk'] = df_slice_hk
-    global_variables.all_file_details['df_all_hk'] = df_all_hk
-    print(f"\n \x1b[1;32;255m Loaded {file_name_hk} in the data base \x1b[0m")
-    return file_val
+    Returns
+    -------
+    bin_index : numpy.ndarray
+        The bin of each ADC count, or "n_bins" if its voltage is outside of the bins.
+    """
+    volts = counts_to_volts(np.arange(2 ** 16), number_of_decimals=number_of_decimals)
+    bin_edges = np.linspace(bin_min, bin_max, n_bins + 1)
 
+    # Each bin has its left edge, and the last one also has its right edge
+    bin_index = np.searchsorted(bin_edges, volts, side="right") - 1
+    bin_index[volts == bin_edges[-1]] = n_bins - 1
+    bin_index[(volts < bin_edges[0]) | (volts > bin_edges[-1])] = n_bins
 
-def open_file_b():
-    # define a global variable for the file name
-    file_val = filedialog.askopenfilename(initialdir="../data/raw_data/",
-                                          title="Select file",
-                                          filetypes=(("text files", "*.txt"),
-                                                     ("all files", "*.*"))
-                                          )
+    bin_index.flags.writeable = False
+    return bin_index
 
-    # Cut path to the file off
-    file_name_b = file_val
-    (df_slice_hk, file_name_hk, df_slice_sci, file_name_sci, df_all_hk, df_all_sci
-     ) = read_binary_file(file_val)
-    global_variables.all_file_details["file_name_b"] = file_name_b
-    global_variables.all_file_details["file_name_hk"] = file_name_hk
-    global_variables.all_file_details["file_name_sci"] = file_name_sci
 
-    global_variables.all_file_details["df_slice_hk"] = df_slice_hk
-    global_variables.all_file_details["df_slice_sci"] = df_slice_sci
-    global_variables.all_file_details["df_all_hk"] = df_all_hk
-    global_variables.all_file_details["df_all_sci"] = df_all_sci
+def histogram_counts(counts=None, n_bins=None, bin_min=None, bin_max=None,
+                     number_of_decimals=None):
+    """
+    Computes the histogram of the voltages of ADC counts with an integer "numpy.bincount", using
+    "count_bin_index" to find the bin of each count. The histogram is the same as
+    "numpy.histogram(counts_to_volts(counts, number_of_decimals), bins=n_bins,
+    range=(bin_min, bin_max))[0]".
+
+    Parameters
+    ----------
+    counts : uint16
+        ADC counts. Default is None.
+    n_bins : int
+        Number of bins. Default is None.
+    bin_min : float
+        Left edge of the first bin. Default is None.
+    bin_max : float
+        Right edge of the last bin. Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages are rounded to. Default is None.
+
+    Returns
+    -------
+    hist : numpy.ndarray
+        Number of counts in each bin.
+    """
+    bin_index = count_bin_index(n_bins=n_bins, bin_min=bin_min, bin_max=bin_max,
+                                number_of_decimals=number_of_decimals)
 
-    print(
-        f"\n Loaded \x1b[1;32;255m{file_name_b}\x1b[0m in the data base,\n  and the csv file for "
-        f"\x1b[1;32;255m HK \x1b[0m and \x1b[1;32;255m SCI \x1b[0m data have been saved to \n "
-        f"HK File : \x1b[1;32;255m{file_name_hk} \x1b[0m \n and \n Sci File: "
-        f"\x1b[1;32;255m{file_name_sci}\x1b[0m")
+    # Count each ADC count first, and then add the counts of each bin
+    count_hist = np.bincount(np.asarray(counts), minlength=2 ** 16)
+    hist = np.bincount(bin_index, weights=count_hist, minlength=n_bins + 1)[:n_bins]
 
-    return file_val
+    return hist.astype(np.int64)
 
 
-def compute_position(v1=None, v2=None, n_bins=401, bin_min=0, bin_max=4):
+def channel_histogram(v=None, n_bins=401, bin_min=0, bin_max=4, number_of_decimals=6):
     """
-    The function computes the position of the particle in the xy-plane. The ratios to compute
-    both the x and y position are taken from Dennis' code. The code computes the offset of the
-    four voltages as measured by LEXI. We then subtract the offset from the four voltages to get
-    the shifted voltages and then compute the position of the particle based on the shifted
-    voltages.
+    Computes the histogram of the voltage of a channel, used to find its offset. The ADC counts,
+    and the voltages which are the ones of ADC counts (as the decoded voltages always are, see
+    "volts_to_counts"), are binned with "histogram_counts". The other voltages are binned with
+    "numpy.histogram". Both give the same histogram.
 
     Parameters
     ----------
-    v1 : float
-        Voltage of the first channel. Default is None.
-    v2 : float
-        Voltage of the second channel. Default is None.
+    v : float or uint16
+        Voltage or ADC counts of the channel. Default is None.
     n_bins : int
-        Number of bins to compute the position. Default is 401.
+        Number of bins of the histogram. Default is 401.
     bin_min : float
-        Minimum value of the bin. Default is 0.
+        Minimum value of the bins. Default is 0.
     bin_max : float
-        Maximum value of the bin. Default is 4.
+        Maximum value of the bins. Default is 4.
+    number_of_decimals : int
+        Number of decimals of the voltages. Default is 6.
 
     Returns
     -------
-    particle_pos : float
-        position of the particle along one of the axis. Whether it gives x or y position depends
-        on which voltages were provided. For example, if v1 and v3 were provided, then the x
-        position is returned. Else if v4 and v2 were provided, then the y position is returned.
-        It is important to note that the order of the voltages is important.
-    v1_shift: float
-        Offset corrected voltage of the first channel.
-    v2_shift: float
-        Offset corrected voltage of the second channel.
+    hist_v : numpy.ndarray
+        Number of values in each bin.
     """
-    bin_size = (bin_max - bin_min) / (n_bins - 1)
+    v = np.asarray(v)
+    if np.issubdtype(v.dtype, np.integer):
+        counts = v
+    else:
+        counts = volts_to_counts(volts=v, number_of_decimals=number_of_decimals)
 
-    # make 1-D histogram of all 4 channels
-    hist_v1 = np.histogram(v1, bins=n_bins, range=(bin_min, bin_max))
-    hist_v2 = np.histogram(v2, bins=n_bins, range=(bin_min, bin_max))
+    if counts is not None:
+        return histogram_counts(counts=counts, n_bins=n_bins, bin_min=bin_min, bin_max=bin_max,
+                                number_of_decimals=number_of_decimals)
 
-    xx = bin_min + bin_size * np.arange(n_bins)
+    return np.histogram(float64_volts(volts=v, number_of_decimals=number_of_decimals),
+                        bins=n_bins, range=(bin_min, bin_max))[0]
 
-    # Find the index where the histogram is the maximum
-    # NOTE/TODO: I don't quite understand why the offset is computed this way. Need to talk to
-    # Dennis about this and get an engineering/physics reason for it.
-    max_index_v1 = np.argmax(hist_v1[0][0:int(n_bins / 2)])
-    max_index_v2 = np.argmax(hist_v2[0][0:int(n_bins / 2)])
 
-    z1_min = 1000 * xx[max_index_v1]
-    z2_min = 1000 * xx[max_index_v2]
+def histogram2d_counts(counts_x=None, counts_y=None, bins=None, range=None,
+                       number_of_decimals=None, density=False):
+    """
+    Computes the 2-D histogram of the voltages of two channels from their ADC counts, with an
+    integer "numpy.bincount". The histogram is the same as the one of "numpy.histogram2d" for the
+    voltages from "counts_to_volts".
 
-    n1_z = z1_min / 1000
-    n2_z = z2_min / 1000
+    Parameters
+    ----------
+    counts_x : uint16
+        ADC counts of the channel along the x-axis. Default is None.
+    counts_y : uint16
+        ADC counts of the channel along the y-axis. Default is None.
+    bins : int
+        Number of bins along each axis. Default is None.
+    range : list
+        The "[[x_min, x_max], [y_min, y_max]]" range of the voltages. Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages are rounded to. Default is None.
+    density : bool
+        Whether to normalize the histogram the same way as "numpy.histogram2d". Default is False.
 
-    v1_shift = v1 - n1_z
-    v2_shift = v2 - n2_z
+    Returns
+    -------
+    hist : numpy.ndarray
+        Number of counts in each bin, with the x-axis along the first dimension.
+    x_edges : numpy.ndarray
+        Edges of the bins along the x-axis.
+    y_edges : numpy.ndarray
+        Edges of the bins along the y-axis.
+    """
+    index_x = count_bin_index(n_bins=bins, bin_min=range[0][0], bin_max=range[0][1],
+                              number_of_decimals=number_of_decimals)[np.asarray(counts_x)]
+    index_y = count_bin_index(n_bins=bins, bin_min=range[1][0], bin_max=range[1][1],
+                              number_of_decimals=number_of_decimals)[np.asarray(counts_y)]
+    in_range = (index_x < bins) & (index_y < bins)
 
-    particle_pos = v2_shift / (v2_shift + v1_shift)
+    hist = np.bincount(index_x[in_range] * bins + index_y[in_range], minlength=bins * bins)
+    hist = hist.reshape(bins, bins).astype(float)
+    x_edges = np.linspace(range[0][0], range[0][1], bins + 1)
+    y_edges = np.linspace(range[1][0], range[1][1], bins + 1)
 
-    return particle_pos, v1_shift, v2_shift
+    if density:
+        total = hist.sum()
+        hist = hist / np.diff(x_edges)[:, None]
+        hist = hist / np.diff(y_edges)[None, :]
+        hist /= total
 
+    return hist, x_edges, y_edges
 
-def read_csv_sci(file_val=None, t_start=None, t_end=None):
+
+def channel_volts(df=None, channel=None, number_of_decimals=6):
     """
-    Reads a csv file and returns a pandas dataframe for the selected time range along with x and
-    y-coordinates.
+    Gets the voltage of a channel from a science dataframe. If the dataframe only has the ADC
+    counts of the channel, the voltage is computed from them.
 
     Parameters
     ----------
-    file_val : str
-        Path to the input file. Default is None.
-    t_start : float
-        Start time of the data. Default is None.
-    t_end : float
-        End time of the data. Default is None.
+    df : pandas.DataFrame
+        The science dataframe. Default is None.
+    channel : str
+        Name of the channel, from "Channel1" to "Channel4". Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages are rounded to. Default is 6.
+
+    Returns
+    -------
+    volts : pandas.Series
+        Voltage of the channel.
     """
+    if channel in df.columns:
+        return float64_volts(volts=df[channel], number_of_decimals=number_of_decimals)
 
-    df = pd.read_csv(file_val, index_col=False)
+    return counts_to_volts(df[channel.replace("Channel", "Count")],
+                           number_of_decimals=number_of_decimals)
 
-    # Check all the keys and find out which one has the word "time" in it
-    for key in df.keys():
-        if "time" in key.lower():
-            time_col = key
-            break
-    # Rename the time column to TimeStamp
-    df.rename(columns={time_col: 'TimeStamp'}, inplace=True)
-    # Set the index to the time column
-    df.set_index('TimeStamp', inplace=True)
-    # Sort the dataframe by timestamp
-    df = df.sort_index()
 
-    if t_start is None:
-        t_start = df.index.min()
-    if t_end is None:
-        t_end = df.index.max()
+def channel_counts(df=None, channel=None, number_of_decimals=6):
+    """
+    Gets the ADC counts of a channel from a science dataframe. If the dataframe only has the
+    voltage of the channel, the counts are computed with "volts_to_counts".
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The science dataframe. Default is None.
+    channel : str
+        Name of the channel, from "Channel1" to "Channel4". Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages were rounded to. Default is 6.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        ADC counts of the channel (uint16), or None if they can not be computed from the
+        voltages.
+    """
+    count_channel = channel.replace("Channel", "Count")
+    if count_channel in df.columns:
+        return df[count_channel].to_numpy()
+
+    return volts_to_counts(df[channel], number_of_decimals=number_of_decimals)
+
+
+def channel_data(df=None, channel=None, number_of_decimals=6):
+    """
+    Gets the data of a channel used to compute the positions: the ADC counts if the dataframe has
+    them, else the voltage as float64 (see "float64_volts").
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The science dataframe. Default is None.
+    channel : str
+        Name of the channel, from "Channel1" to "Channel4". Default is None.
+    number_of_decimals : int
+        Number of decimals the voltages were rounded to. Default is 6.
+
+    Returns
+    -------
+    data : pandas.Series
+        ADC counts or voltage of the channel.
+    """
+    count_channel = channel.replace("Channel", "Count")
+    if count_channel in df.columns:
+        return df[count_channel]
+
+    return float64_volts(volts=df[channel], number_of_decimals=number_of_decimals)
+
+
+def apply_schema(df=None, schema=None):
+    """
+    Casts the columns of a science or housekeeping dataframe to the data types of "sci_schema" or
+    "hk_schema". The columns which are not in the schema are not changed, and an integer column
+    is only cast if it has no NaNs.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe. Default is None.
+    schema : dict
+        Data type of each column, either "sci_schema" or "hk_schema". Default is None.
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The dataframe with the new data types.
+    """
+    dtypes = {}
+    for key, dtype in schema.items():
+        if key not in df.columns or df[key].dtype == dtype:
+            continue
+        if np.issubdtype(dtype, np.integer) and df[key].isna().any():
+            continue
+        dtypes[key] = dtype
+
+    if len(dtypes) == 0:
+        return df
+
+    return df.astype(dtypes, copy=False)
+
+
+def compute_channel_offsets(df=None, n_bins=401, bin_min=0, bin_max=4):
+    """
+    Computes the offset of each of the four channels of a science dataframe with
+    "compute_channel_offset".
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The science dataframe, with either the voltages or the ADC counts of the channels. Default
+        is None.
+    n_bins : int
+        Number of bins of the histograms. Default is 401.
+    bin_min : float
+        Minimum value of the bins. Default is 0.
+    bin_max : float
+        Maximum value of the bins. Default is 4.
+
+    Returns
+    -------
+    channel_offsets : dict
+        Offset of the voltage of each channel, from "Channel1" to "Channel4".
+    """
+    return {key: compute_channel_offset(v=channel_data(df, key), n_bins=n_bins, bin_min=bin_min,
+                                        bin_max=bin_max)
+            for key in ["Channel1", "Channel2", "Channel3", "Channel4"]}
+
+
+def add_positions(df=None, channel_offsets=None):
+    """
+    Adds the x and y-coordinates of the particles and the shifts of the voltages to a science
+    dataframe, and casts its columns to "sci_schema". The positions are computed with
+    "compute_positions", with the given offsets of the channels, which are kept in
+    "df.attrs["channel_offsets"]". So the time ranges selected from the dataframe have the
+    offsets as well, and they are only computed once per dataset.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The science dataframe, with either the voltages or the ADC counts of the channels. Default
+        is None.
+    channel_offsets : dict
+        Offset of the voltage of each channel, as returned by "compute_channel_offsets". Default
+        is None, in which case they are computed from "df".
+
+    Returns
+    -------
+    df : pandas.DataFrame
+        The dataframe with the columns "x_val", "y_val" and "v1_shift" to "v4_shift".
+    """
+    # The ADC counts, or else the voltages, of the channels are passed as they are, and
+    # "compute_positions" converts them to float64 voltages one chunk at a time
+    channels = [df[f"Count{ii}"] if f"Count{ii}" in df.columns else df[f"Channel{ii}"]
+                for ii in range(1, 5)]
+    positions, channel_offsets = compute_positions(v1=channels[0], v2=channels[1],
+                                                   v3=channels[2], v4=channels[3],
+                                                   channel_offsets=channel_offsets, n_bins=401,
+                                                   bin_min=0, bin_max=4)
+
+    # Add the x and y-coordinates to the dataframe
+    for key in ["x_val", "v1_shift", "v3_shift", "y_val", "v4_shift", "v2_shift"]:
+        df[key] = positions[key]
+
+    df = apply_schema(df=df, schema=sci_schema)
+    df.attrs["channel_offsets"] = channel_offsets
+
+    return df
 
-    # Select dataframe from timestamp t_start to t_end
-    df_slice_sci = df.loc[t_start:t_end]
 
-    # For both the sliced and entire dataframes, compute the x and y-coordinates and the shift in
-    # the voltages
-    x_slice, v1_shift_slice, v3_shift_slice = compute_position(v1=df_slice_sci['Channel1'],
-                                                               v2=df_slice_sci['Channel3'],
-                                                               n_bins=401, bin_min=0, bin_max=4)
+def slice_positions(df_slice=None, slice_offsets=False):
+    """
+    Gets the x and y-coordinates of a time range selected from a science dataframe. By default
+    the selection keeps the ones of the whole dataframe, which use the offsets of the whole
+    dataframe. If "slice_offsets" is True, the offsets are estimated again from the selected data
+    only, and the coordinates are computed again with them in a copy of the selection.
+
+    Parameters
+    ----------
+    df_slice : pandas.DataFrame
+        The selected time range of a science dataframe. Default is None.
+    slice_offsets : bool
+        Whether to estimate the offsets of the channels again from the selected data. Default is
+        False.
+
+    Returns
+    -------
+    df_slice : pandas.DataFrame
+        The selection, with its x and y-coordinates.
+    """
+    if not slice_offsets:
+        return df_slice
 
-    x, v1_shift, v3_shift = compute_position(v1=df['Channel1'], v2=df['Channel3'], n_bins=401,
-                                             bin_min=0, bin_max=4)
+    return add_positions(df=df_slice.copy())
 
-    # Add the x-coordinate to the dataframe
-    df_slice_sci.loc[:, 'x_val'] = x_slice
-    df_slice_sci.loc[:, 'v1_shift'] = v1_shift_slice
-    df_slice_sci.loc[:, 'v3_shift'] = v3_shift_slice
 
-    df.loc[:, 'x_val'] = x
-    df.loc[:, 'v1_shift'] = v1_shift
-    df.loc[:, 'v3_shift'] = v3_shift
+def read_csv_sci(file_val=None, t_start=None, t_end=None, window_only=False, slice_offsets=False):
+    """
+    Reads a processed file (csv, npz, parquet or feather) and returns a pandas dataframe for the
+    selected time range along with x and y-coordinates.
 
-    y_slice, v4_shift_slice, v2_shift_slice = compute_position(v1=df_slice_sci['Channel4'],
-                                                               v2=df_slice_sci['Channel2'],
-                                                               n_bins=401, bin_min=0, bin_max=4)
+    Parameters
+    ----------
+    file_val : str
+        Path to the input file. Default is None.
+    t_start : float
+        Start time of the data. Default is None.
+    t_end : float
+        End time of the data. Default is None.
+    window_only : bool
+        Whether to only read the rows between "t_start" and "t_end" from the file, see
+        "read_processed_file". The entire dataframe then only has these rows. Default is False.
+    slice_offsets : bool
+        Whether to compute the x and y-coordinates of the selected time range with the offsets of
+        the channels estimated from the selected data only, see "slice_positions". Default is
+        False, which uses the ones of the entire dataframe.
+    """
 
-    y, v4_shift, v2_shift = compute_position(v1=df['Channel4'], v2=df['Channel2'], n_bins=401,
-                                             bin_min=0, bin_max=4)
+    if window_only:
+        df = read_processed_file(file_val=file_val, t_start=t_start, t_end=t_end)
+    else:
+        df = read_processed_file(file_val=file_val)
+    # Sort the dataframe by timestamp
+    df = df.sort_index()
 
-    # Add the y-coordinate to the dataframe
-    df_slice_sci.loc[:, 'y_val'] = y_slice
-    df_slice_sci.loc[:, 'v4_shift'] = v4_shift_slice
-    df_slice_sci.loc[:, 'v2_shift'] = v2_shift_slice
+    # Compute the x and y-coordinates and the shift in the voltages once for the entire
+    # dataframe, the selected time range is then a view of it
+    df = add_positions(df=df)
 
-    df.loc[:, 'y_val'] = y
-    df.loc[:, 'v4_shift'] = v4_shift
-    df.loc[:, 'v2_shift'] = v2_shift
+    # Select dataframe from timestamp t_start to t_end
+    df_slice_sci = slice_positions(df_slice=lxds.time_slice(df=df, t_start=t_start, t_end=t_end),
+                                   slice_offsets=slice_offsets)
 
     return df, df_slice_sci
 
 
-def read_csv_hk(file_val=None, t_start=None, t_end=None):
+def read_csv_hk(file_val=None, t_start=None, t_end=None, window_only=False):
     """
-    Reads a csv file and returns a pandas dataframe for the selected time range along with x and
-    y-coordinates.
+    Reads a processed file (csv, npz, parquet or feather) and returns a pandas dataframe for the
+    selected time range.
 
     Parameters
     ----------
@@ -628,35 +2740,30 @@ def read_csv_hk(file_val=None, t_start=None, t_end=None):
         Start time of the data. Default is None.
     t_end : float
         End time of the data. Default is None.
+    window_only : bool
+        Whether to only read the rows between "t_start" and "t_end" from the file, see
+        "read_processed_file". The entire dataframe then only has these rows. Default is False.
     """
 
     global df_slice_hk
-    df = pd.read_csv(file_val)
-
-    # Check all the keys and find out which one has the word "time" in it
-    for key in df.keys():
-        if "time" in key.lower():
-            time_col = key
-            break
-    # Rename the time column to TimeStamp
-    df.rename(columns={time_col: 'TimeStamp'}, inplace=True)
-    # Set the index to the time column
-    df.set_index('TimeStamp', inplace=True)
+    if window_only:
+        df = read_processed_file(file_val=file_val, t_start=t_start, t_end=t_end)
+    else:
+        df = read_processed_file(file_val=file_val)
     # Sort the dataframe by timestamp
     df = df.sort_index()
 
-    if t_start is None:
-        t_start = df.index.min()
-    if t_end is None:
-        t_end = df.index.max()
+    df = apply_schema(df=df, schema=hk_schema)
 
     # Select dataframe from timestamp t_start to t_end
-    df_slice_hk = df.loc[t_start:t_end]
+    df_slice_hk = lxds.time_slice(df=df, t_start=t_start, t_end=t_end)
 
     return df, df_slice_hk
 
 
-def read_binary_file(file_val=None, t_start=None, t_end=None):
+def read_binary_file(file_val=None, t_start=None, t_end=None, use_mmap=False, n_workers=1,
+                     save_file=True, save_format="csv", use_cache=False, keep_counts=False,
+                     use_index=False, slice_offsets=False):
     """
     Reads the binary file using functions saved in the file "lxi_read_binary_data.py" and returns
     a pandas dataframe for the selected time range along with x and y-coordinates.
@@ -669,6 +2776,31 @@ def read_binary_file(file_val=None, t_start=None, t_end=None):
         Start time of the data. Default is None.
     t_end : float
         End time of the data. Default is None.
+    use_mmap : bool
+        Whether to memory-map the binary file instead of reading it in memory. Default is False.
+    n_workers : int
+        Number of processes used to decode the binary file. Default is 1.
+    save_file : bool
+        Whether to save the science and housekeeping data to files. The data loaded from the cache
+        is saved with "save_cached_data". Default is True.
+    save_format : str
+        Format of the saved files, one of "save_formats". Default is "csv".
+    use_cache : bool
+        Whether to look up the decoded data in "raw_file_cache" before decoding the binary file,
+        and to add it to the cache after decoding. The cached science data already has the x and
+        y-coordinates, and the cached housekeeping data keeps its float64 values, so that the files
+        saved from the cache are the same. Default is False.
+    keep_counts : bool
+        Whether to keep the channels as the raw ADC counts in the science dataframes, see
+        "read_binary_data". Default is False.
+    use_index : bool
+        Whether to only decode the packets between "t_start" and "t_end", using the packet index of
+        the binary file (see "decode_file_window"). The entire dataframes then only have the
+        packets in this time window, and the cache is not used. Default is False.
+    slice_offsets : bool
+        Whether to compute the x and y-coordinates of the selected time range with the offsets of
+        the channels estimated from the selected data only, see "slice_positions". Default is
+        False, which uses the ones of the entire dataframe.
 
     Returns
     -------
@@ -681,74 +2813,208 @@ def read_binary_file(file_val=None, t_start=None, t_end=None):
     df_sci : pandas.DataFrame
         The Science dataframe for the entire time range in the file.
     file_name_hk : str
-        The name of the Housekeeping file.
+        The name of the Housekeeping file, or None if the data was not saved.
     file_name_sci : str
-        The name of the Science file.
+        The name of the Science file, or None if the data was not saved.
     """
 
-    # Read the housekeeping data
-    df_hk, file_name_hk = read_binary_data_hk(
-        in_file_name=file_val,
-        save_file_name=None,
-        number_of_decimals=6
-    )
+    df_sci, df_hk = None, None
+    # The cache has the data of the entire file, so it is not used for a time window
+    use_cache = use_cache and not use_index
+    if use_cache:
+        df_sci, df_hk = raw_file_cache.load(in_file_name=file_val,
+                                            version=[decoder_version, keep_counts])
+
+    if df_sci is not None:
+        print(f"\n Loaded \x1b[1;32;255m{file_val}\x1b[0m from the cache")
+        file_name_sci, file_name_hk = None, None
+        if save_file:
+            file_name_sci, file_name_hk = save_cached_data(in_file_name=file_val, df_sci=df_sci,
+                                                           df_hk=df_hk, save_format=save_format)
+        df_hk = apply_schema(df=df_hk, schema=hk_schema)
+    else:
+        # Read the science and housekeeping data
+        df_sci, file_name_sci, df_hk, file_name_hk = read_binary_data(
+            in_file_name=file_val,
+            number_of_decimals=6,
+            use_mmap=use_mmap,
+            n_workers=n_workers,
+            save_file=save_file,
+            save_format=save_format,
+            keep_counts=keep_counts,
+            t_start=t_start if use_index else None,
+            t_end=t_end if use_index else None
+        )
 
-    # Read the science data
-    df_sci, file_name_sci = read_binary_data_sci(
-        in_file_name=file_val,
-        save_file_name=None,
-        number_of_decimals=6
-    )
+        # Replace index with timestamp
+        df_hk.set_index('TimeStamp', inplace=True)
+        df_sci.set_index('TimeStamp', inplace=True)
 
-    # Replace index with timestamp
-    df_hk.set_index('TimeStamp', inplace=True)
-    df_sci.set_index('TimeStamp', inplace=True)
+        # Sort the dataframe by timestamp
+        df_hk = df_hk.sort_index()
+        df_sci = df_sci.sort_index()
 
-    # Sort the dataframe by timestamp
-    df_hk = df_hk.sort_index()
-    df_sci = df_sci.sort_index()
+        # For the entire dataframe, compute the x and y-coordinates and the shift in the voltages
+        df_sci = add_positions(df=df_sci)
+
+        # The housekeeping data is cached before its schema is applied, so that the files saved
+        # from the cache have the float64 values
+        if use_cache:
+            raw_file_cache.save(in_file_name=file_val, version=[decoder_version, keep_counts],
+                                df_sci=df_sci, df_hk=df_hk)
+        df_hk = apply_schema(df=df_hk, schema=hk_schema)
 
     if t_start is None:
         t_start = df_sci.index.min()
     if t_end is None:
         t_end = df_sci.index.max()
 
-    # Select dataframe from timestamp t_start to t_end
-    df_slice_hk = df_hk.loc[t_start:t_end]
-    df_slice_sci = df_sci.loc[t_start:t_end]
-
-    # For both the sliced and entire dataframes, compute the x and y-coordinates and the shift in
-    # the voltages
-    x_slice, v1_shift_slice, v3_shift_slice = compute_position(v1=df_slice_sci['Channel1'],
-                                                               v2=df_slice_sci['Channel3'],
-                                                               n_bins=401, bin_min=0, bin_max=4)
+    # Select dataframe from timestamp t_start to t_end. The selections are views of the entire
+    # dataframes, which already have the x and y-coordinates.
+    df_slice_hk = lxds.time_slice(df=df_hk, t_start=t_start, t_end=t_end)
+    df_slice_sci = slice_positions(df_slice=lxds.time_slice(df=df_sci, t_start=t_start,
+                                                            t_end=t_end),
+                                   slice_offsets=slice_offsets)
 
-    x, v1_shift, v3_shift = compute_position(v1=df_sci['Channel1'], v2=df_sci['Channel3'],
-                                             n_bins=401, bin_min=0, bin_max=4)
-
-    # Add the x-coordinate to the dataframe
-    df_slice_sci.loc[:, 'x_val'] = x_slice
-    df_slice_sci.loc[:, 'v1_shift'] = v1_shift_slice
-    df_slice_sci.loc[:, 'v3_shift'] = v3_shift_slice
-
-    df_sci.loc[:, 'x_val'] = x
-    df_sci.loc[:, 'v1_shift'] = v1_shift
-    df_sci.loc[:, 'v3_shift'] = v3_shift
-
-    y_slice, v4_shift_slice, v2_shift_slice = compute_position(v1=df_slice_sci['Channel4'],
-                                                               v2=df_slice_sci['Channel2'],
-                                                               n_bins=401, bin_min=0, bin_max=4)
+    return df_slice_hk, file_name_hk, df_slice_sci, file_name_sci, df_hk, df_sci
 
-    y, v4_shift, v2_shift = compute_position(v1=df_sci['Channel4'], v2=df_sci['Channel2'],
-                                             n_bins=401, bin_min=0, bin_max=4)
 
-    # Add the y-coordinate to the dataframe
-    df_slice_sci.loc[:, 'y_val'] = y_slice
-    df_slice_sci.loc[:, 'v4_shift'] = v4_shift_slice
-    df_slice_sci.loc[:, 'v2_shift'] = v2_shift_slice
+class binary_file_follower():
+    """
+    Class for following a binary file while it is being written. Each call of "update" reads and
+    decodes only the bytes which were added to the file since the previous call. The partial packet
+    at the end of the previous read is kept by a "packet_stream_decoder", so the packets are the
+    same as if the whole file had been decoded in one go.
+
+    Attributes:
+        in_file_name: str
+            Name of the binary file.
+        number_of_decimals: int
+            Number of decimals of the voltages.
+        decoder: packet_stream_decoder
+            Decoder of the bytes of the file.
+        n_bytes_read: int
+            Number of bytes of the file which have been read.
+        n_skip_sci: int
+            Number of science packets at the start of the file which are not returned by "update",
+            for example because they have already been loaded with "read_binary_file".
+        n_skip_hk: int
+            Number of housekeeping packets at the start of the file which are not returned by
+            "update".
+        channel_offsets: dict
+            Offset of the voltage of each channel, used to compute the x and y-coordinates of the
+            new rows. If None, it is computed from the first science data.
+        last_hk: pandas.DataFrame
+            Last housekeeping row of the file, used to fill the NaNs of the next rows.
+        data_versions: dict
+            Versions of the science and housekeeping data in the data store of the session which
+            have the rows of the file, set by "update_file_b", so that the new rows are only
+            appended to the data of the same file.
+    """
 
-    df_sci.loc[:, 'y_val'] = y
-    df_sci.loc[:, 'v4_shift'] = v4_shift
-    df_sci.loc[:, 'v2_shift'] = v2_shift
+    def __init__(self, in_file_name=None, number_of_decimals=6, n_skip_sci=0, n_skip_hk=0,
+                 channel_offsets=None):
+        self.in_file_name = in_file_name
+        self.number_of_decimals = number_of_decimals
+        self.decoder = packet_stream_decoder()
+        self.n_bytes_read = 0
+        self.n_skip_sci = n_skip_sci
+        self.n_skip_hk = n_skip_hk
+        self.channel_offsets = channel_offsets
+        self.last_hk = None
+        self.data_versions = {}
+
+    def skip_loaded_data(self, n_bytes=None, df_hk=None):
+        """
+        Sets the follower to the state it would have after reading the first "n_bytes" bytes of the
+        file, for example the ones which were loaded with "read_binary_file", so that the next
+        update only decodes the bytes added after them. Only the end of these bytes is searched for
+        the packets, see "packet_stream_decoder.seek".
+
+        Parameters
+        ----------
+        n_bytes : int
+            Number of bytes of the file which have been loaded. Default is None.
+        df_hk : pandas.DataFrame
+            The housekeeping data of these bytes, with "TimeStamp" as the index. Its last row fills
+            the NaNs of the next rows. Default is None.
+
+        Returns
+        -------
+        is_found : bool
+            Whether the state could be found. If not, the follower is not changed.
+        """
+        if not self.decoder.seek(in_file_name=self.in_file_name, n_bytes=n_bytes):
+            return False
+
+        self.n_bytes_read = n_bytes
+        self.n_skip_sci = 0
+        self.n_skip_hk = 0
+        if df_hk is not None and len(df_hk) > 0:
+            # The file is written in time order, so the last row by time is the last one of the file
+            self.last_hk = df_hk.iloc[-1:].reset_index()
+
+        return True
+
+    def update(self):
+        """
+        Decodes the bytes which were added to the file since the previous call.
+
+        Raises
+        ------
+        ValueError :
+            If the file is shorter than when it was last read.
+
+        Returns
+        -------
+        df_sci : pandas.DataFrame
+            The new science rows, with "TimeStamp" as the index and with the x and y-coordinates.
+        df_hk : pandas.DataFrame
+            The new housekeeping rows, with "TimeStamp" as the index.
+        """
+        if Path(self.in_file_name).stat().st_size < self.n_bytes_read:
+            raise ValueError(
+                f"The file {self.in_file_name} is shorter than when it was last read."
+            )
 
-    return df_slice_hk, file_name_hk, df_slice_sci, file_name_sci, df_hk, df_sci
+        with open(self.in_file_name, 'rb') as file:
+            file.seek(self.n_bytes_read)
+            data = file.read()
+        self.n_bytes_read += len(data)
+
+        sci_packets, hk_packets = split_packets(self.decoder.feed(data))
+
+        # Drop the science packets which are skipped
+        n_skip_sci = min(self.n_skip_sci, len(sci_packets))
+        self.n_skip_sci -= n_skip_sci
+        df_sci, _ = process_sci_packets(packets=sci_packets[n_skip_sci:],
+                                        in_file_name=self.in_file_name,
+                                        number_of_decimals=self.number_of_decimals,
+                                        save_file=False)
+
+        # Fill the NaNs of the housekeeping data starting from the last row of the previous call.
+        # The skipped packets are only dropped afterwards, so that their values are carried over.
+        df_hk, _ = process_hk_packets(packets=hk_packets, in_file_name=self.in_file_name,
+                                      number_of_decimals=self.number_of_decimals, fill_nan=False,
+                                      save_file=False)
+        if self.last_hk is not None:
+            df_hk = pd.concat([self.last_hk, df_hk]).ffill().iloc[1:]
+        else:
+            df_hk = df_hk.ffill()
+        if len(df_hk) > 0:
+            self.last_hk = df_hk.iloc[-1:]
+        n_skip_hk = min(self.n_skip_hk, len(df_hk))
+        self.n_skip_hk -= n_skip_hk
+        df_hk = df_hk.iloc[n_skip_hk:]
+
+        df_sci = df_sci.set_index('TimeStamp').sort_index()
+        df_hk = df_hk.set_index('TimeStamp').sort_index()
+
+        if self.channel_offsets is None and len(df_sci) > 0:
+            self.channel_offsets = compute_channel_offsets(df=df_sci)
+
+        # Compute the x and y-coordinates of the new rows with the stored offsets
+        if self.channel_offsets is not None:
+            df_sci = add_positions(df=df_sci, channel_offsets=self.channel_offsets)
+
+        return apply_schema(df=df_sci, schema=sci_schema), apply_schema(df=df_hk, schema=hk_schema)
@@ -91,7 +91,9 @@ def hist_plot_inputs(dpi=100):
         "v_sum_min": v_sum_min_thresh_entry.get(),
         "v_sum_max": v_sum_max_thresh_entry.get(),
         "crv_fit": curve_fit_status_var.get(),
-        "use_fig_size": True
+        "use_fig_size": True,
+        "data_version": lxrf.loaded_data_version(file_type="sci"),
+        "hist_cube_cadence": 60 if hist_cube_status_var.get() else None
     }
 
     llpr.load_all_hist_plots(**inputs)
@@ -306,8 +308,23 @@ b_file_load_entry = tk.Entry(sci_tab, textvariable=b_file_name, font=font_style,
                              bg="snow", fg="black", relief="sunken", borderwidth=2)
 b_file_load_entry.grid(row=5, column=0, columnspan=2, pady=0, sticky="ew")
 
+# Choose whether to save the decoded science and housekeeping data of the binary file to csv
+# files when it is loaded (is Bool)
+b_file_save_var = tk.BooleanVar()
+b_file_save_var.set(False)
+b_file_save_checkbox = tk.Checkbutton(sci_tab, text="Save decoded files", font=font_style,
+                                      variable=b_file_save_var)
+b_file_save_checkbox.grid(row=0, column=1, columnspan=1, pady=0, sticky="w")
+
 # insert the file_load_entry value into the entry box only if the b_file_load_button is clicked
-b_file_load_button.config(command=lambda: b_file_load_entry.insert(0, lxrf.open_file_b()))
+b_file_load_button.config(command=lambda: b_file_load_entry.insert(
+    0, lxrf.open_file_b(save_file=b_file_save_var.get())))
+
+# Decode the data which was added to the binary file since it was loaded, for example while the
+# file is still being written during a test
+b_file_update_button = tk.Button(sci_tab, text="Update binary File", command=lxrf.update_file_b,
+                                 font=font_style)
+b_file_update_button.grid(row=4, column=1, columnspan=1, pady=0, sticky="ew")
 
 # If a new file is loaded, then print its name in the entry box and update the file_name variable.
 sci_file_name.trace("w", lambda *_: sci_file_name.set(lmsc.file_name_update(file_type="sci")))
@@ -472,6 +489,22 @@ curve_fit_checkbox.grid(row=14, column=4, columnspan=1, sticky="n")
 
 curve_fit_status_var.trace("w", lambda *_: hist_plot_inputs(dpi=dpi))
 
+# Choose whether to find the histogram of the time window from the time-cumulative histograms of
+# the loaded data (is Bool). They take some time to compute for each new data, bins, range or cut,
+# but then changing the time window is fast.
+hist_cube_label = tk.Label(sci_tab, text="Time Cube", font=font_style_box, bg="white",
+                           fg="black")
+hist_cube_label.grid(row=15, column=5, columnspan=1, sticky="n")
+
+# Add a checkbox to choose whether to use the time-cumulative histograms or not
+hist_cube_status_var = tk.BooleanVar()
+hist_cube_status_var.set(False)
+hist_cube_checkbox = tk.Checkbutton(sci_tab, text="", font=font_style_box,
+                                    variable=hist_cube_status_var, bg="white", fg="black")
+hist_cube_checkbox.grid(row=15, column=4, columnspan=1, sticky="n")
+
+hist_cube_status_var.trace("w", lambda *_: hist_plot_inputs(dpi=dpi))
+
 # Add a button to save the data to a cdf file
 #cdf_save_button = tk.Button(
 #    sci_tab, text="Save CDF", command=lambda: save_cdf(), font=font_style_box,
@@ -7,10 +7,23 @@ import numpy as np
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 
 import global_variables
+import lxi_file_read_funcs as lxrf
+import lxi_hist_engine as lxhe
 import lxi_misc_codes as lmsc
+import lxi_selection as lxsl
 
 importlib.reload(global_variables)
+importlib.reload(lxrf)
+importlib.reload(lxhe)
 importlib.reload(lmsc)
+importlib.reload(lxsl)
+
+# Cache of the counts of the histograms, used when the version of the plotted data is known
+hist_cache = lxhe.hist_engine(max_entries=32)
+# Cache of the time-cumulative histograms, which are much larger, so only the last ones are kept
+cube_cache = lxhe.hist_engine(max_entries=2)
+# Cache of the rows selected by the cuts on the voltages, shared by all the science plots
+selection = lxsl.selection_cache(max_entries=16)
 
 
 class plot_data_class():
@@ -82,6 +95,18 @@ class plot_data_class():
             The height of the voltage plot. Default is 6.
         volt_fig_width: float
             The width of the voltage plot. Default is 12.
+        data_version: int
+            The version of the science data in the data store (see
+            "lxi_file_read_funcs.loaded_data_version"). If given, the counts of the histograms are
+            cached in "hist_cache", so that changing only the colour scale, the density or the
+            curve fit does not bin the data again. Default is None, which does not cache them.
+        hist_cube_cadence: float
+            If given with "data_version", the histogram of the (x,y) plane is found from
+            time-cumulative histograms with a step of "hist_cube_cadence" seconds (see
+            "lxi_hist_engine.hist_cube"). They are computed once for the loaded data and the
+            filters, and then the histogram of any time window is found without binning the data
+            again, which makes changing the start and end times fast. Default is None, which bins
+            the data of each time window.
 
     Methods:
         ts_plots:
@@ -170,6 +195,8 @@ class plot_data_class():
                  v_sum_max=None,
                  crv_fit=None,
                  use_fig_size=None,
+                 data_version=None,
+                 hist_cube_cadence=None,
                  ):
         self.df_slice_hk = df_slice_hk
         self.df_slice_sci = df_slice_sci
@@ -199,6 +226,8 @@ class plot_data_class():
         self.v_sum_max = v_sum_max
         self.crv_fit = crv_fit
         self.use_fig_size = use_fig_size
+        self.data_version = data_version
+        self.hist_cube_cadence = hist_cube_cadence
 
     def ts_plots(self):
         """
@@ -350,29 +379,32 @@ class plot_data_class():
         x_range = [x_min, x_max]
         y_range = [y_min, y_max]
 
-        # Remove rows with duplicate indices
-        self.df_slice_sci = self.df_slice_sci[~self.df_slice_sci.index.duplicated(keep='first')]
-
-        # Select data in the specified time range
-        self.df_slice_sci = self.df_slice_sci.loc[t_start:t_end]
-        # Exclude channel1 to channel4 data based on v_min and v_max
-        # Check if either v_min or v_max or v_sum_min or v_sum_max are None
-        self.df_slice_sci = self.df_slice_sci[(self.df_slice_sci["Channel1"] >= v_min) &
-                                              (self.df_slice_sci["Channel1"] <= v_max) &
-                                              (self.df_slice_sci["Channel2"] >= v_min) &
-                                              (self.df_slice_sci["Channel2"] <= v_max) &
-                                              (self.df_slice_sci["Channel3"] >= v_min) &
-                                              (self.df_slice_sci["Channel3"] <= v_max) &
-                                              (self.df_slice_sci["Channel4"] >= v_min) &
-                                              (self.df_slice_sci["Channel4"] <= v_max) &
-                                              ((self.df_slice_sci["v1_shift"] +
-                                                self.df_slice_sci["v2_shift"] +
-                                                self.df_slice_sci["v3_shift"] +
-                                                self.df_slice_sci["v4_shift"]) >= v_sum_min) &
-                                              ((self.df_slice_sci["v1_shift"] +
-                                                self.df_slice_sci["v2_shift"] +
-                                                self.df_slice_sci["v3_shift"] +
-                                                self.df_slice_sci["v4_shift"]) <= v_sum_max)]
+        # The selected rows are cached for the loaded data, and found again once it changes
+        data_key = None if self.data_version is None else ("sci", self.data_version)
+
+        def filter_data(t_min=None, t_max=None):
+            # Remove rows with duplicate indices, and exclude channel1 to channel4 data based on
+            # v_min, v_max, v_sum_min and v_sum_max
+            mask = selection.mask(df=self.df_slice_sci, data_key=data_key, v_min=v_min,
+                                  v_max=v_max, v_sum_min=v_sum_min, v_sum_max=v_sum_max)
+            df = self.df_slice_sci[mask]
+
+            # Select data in the specified time range
+            df = df.loc[t_min:t_max]
+
+            # Drop all nans in the data
+            df = df.dropna()
+            # Try to select only rows where "IsCommanded" is False
+            try:
+                df = df[df["IsCommanded"] == False]
+            except Exception:
+                pass
+
+            return df
+
+        def get_data():
+            self.df_slice_sci = filter_data(t_min=t_start, t_max=t_end)
+            return self.df_slice_sci["x_val"], self.df_slice_sci["y_val"]
 
         if self.use_fig_size:
             fig = plt.figure(num=None, figsize=(self.hist_fig_width, self.hist_fig_height),
@@ -386,19 +418,37 @@ class plot_data_class():
         y_hist = fig.add_subplot(gs[:-1, 0], sharey=axs1)
         x_hist = fig.add_subplot(gs[-1, 1:], sharex=axs1)
 
-        # Drop all nans in the data
-        self.df_slice_sci = self.df_slice_sci.dropna()
-        # Try to select only rows where "IsCommanded" is False
-        try:
-            self.df_slice_sci = self.df_slice_sci[self.df_slice_sci["IsCommanded"] == False]
-        except Exception:
-            pass
-        # Plot the histogram on axs1
-        counts, xedges, yedges, im = axs1.hist2d(self.df_slice_sci["x_val"],
-                                                 self.df_slice_sci["y_val"], bins=bins,
-                                                 cmap='Spectral', norm=norm,
-                                                 range=[x_range, y_range], cmin=cmin,
-                                                 density=density)
+        # The counts only depend on the data, the bins and the filters, so they are only computed
+        # again if one of these changes
+        key = None
+        if self.data_version is not None:
+            key = ("hist_plots", self.data_version, t_start, t_end, bins, tuple(x_range),
+                   tuple(y_range), v_min, v_max, v_sum_min, v_sum_max)
+        if (self.hist_cube_cadence is not None and self.data_version is not None and
+                x_range[0] < x_range[1] and y_range[0] < y_range[1]):
+            # The time-cumulative histograms only depend on the filters, so the histogram of a new
+            # time window is the difference of two of their slices
+            cube_key = ("hist_cube", self.data_version, bins, tuple(x_range), tuple(y_range),
+                        v_min, v_max, v_sum_min, v_sum_max, self.hist_cube_cadence)
+            cube = cube_cache.get(key=cube_key)
+            if cube is None:
+                df = filter_data()
+                cube = lxhe.hist_cube(times=df.index.to_numpy(), x=df["x_val"].to_numpy(),
+                                      y=df["y_val"].to_numpy(), bins=bins,
+                                      range=[x_range, y_range], cadence=self.hist_cube_cadence)
+                cube_cache.put(key=cube_key, value=cube)
+            hist_counts, xedges, yedges = cube.window(t_start=t_start, t_end=t_end)
+        else:
+            hist_counts, xedges, yedges = hist_cache.histogram2d(key=key, get_data=get_data,
+                                                                 bins=bins,
+                                                                 range=[x_range, y_range])
+
+        # Plot the histogram on axs1, the same way as "hist2d". "cmax" is only the top of the
+        # colour scale, the bins above it are still drawn
+        counts, xedges, yedges, im = lxhe.draw_hist2d(axs=axs1, counts=hist_counts,
+                                                      xedges=xedges, yedges=yedges,
+                                                      density=density, cmin=cmin,
+                                                      cmap='Spectral', norm=norm)
 
         # Find the index of the maximum value in counts, ignoring NaNs
         max_index = np.unravel_index(np.nanargmax(counts, axis=None), counts.shape)
@@ -571,34 +621,58 @@ class plot_data_class():
         elif norm == 'linear':
             norm = mpl.colors.Normalize(vmin=cmin, vmax=cmax)
 
-        self.df_slice_sci = self.df_slice_sci[~self.df_slice_sci.index.duplicated(keep='first')]
+        # The selected rows are cached for the loaded data, and found again once it changes
+        data_key = None if self.data_version is None else ("sci", self.data_version)
+
+        def get_histogram():
+            # Remove rows with duplicate indices, and exclude channel1 to channel4 data based on
+            # v_min and v_max
+            df = self.df_slice_sci[selection.mask(df=self.df_slice_sci, data_key=data_key,
+                                                  v_min=v_min, v_max=v_max)]
+            self.df_slice_sci = df
 
-        # Exclude channel1 to channel4 data based on v_min and v_max
-        if v_min is not None and v_max is not None:
-            self.df_slice_sci = self.df_slice_sci[(self.df_slice_sci["Channel1"] >= v_min) &
-                                                  (self.df_slice_sci["Channel1"] <= v_max) &
-                                                  (self.df_slice_sci["Channel2"] >= v_min) &
-                                                  (self.df_slice_sci["Channel2"] <= v_max) &
-                                                  (self.df_slice_sci["Channel3"] >= v_min) &
-                                                  (self.df_slice_sci["Channel3"] <= v_max) &
-                                                  (self.df_slice_sci["Channel4"] >= v_min) &
-                                                  (self.df_slice_sci["Channel4"] <= v_max)]
+            df_time = df[(df.index >= t_start) & (df.index <= t_end)]
+            v1 = lxrf.channel_volts(df_time, self.channel1)
+            v2 = lxrf.channel_volts(df_time, self.channel2)
 
-        v1 = self.df_slice_sci[self.channel1][
-            (self.df_slice_sci.index >= t_start) & (self.df_slice_sci.index <= t_end)]
-        v2 = self.df_slice_sci[self.channel2][
-            (self.df_slice_sci.index >= t_start) & (self.df_slice_sci.index <= t_end)]
+            x_range = [0.9 * np.nanmin(v1), 1.1 * np.nanmax(v1)]
+            y_range = [0.9 * np.nanmin(v2), 1.1 * np.nanmax(v2)]
+
+            # The voltages are ADC counts times "volts_per_count", so they can be histogrammed
+            # with an integer bincount of the counts instead of binning the floats. This gives the
+            # same histogram as binning the voltages, which is only done if the counts are not
+            # available.
+            c1 = lxrf.channel_counts(df_time, self.channel1)
+            c2 = lxrf.channel_counts(df_time, self.channel2)
+            if c1 is not None and c2 is not None and x_range[0] < x_range[1] and \
+                    y_range[0] < y_range[1]:
+                return lxrf.histogram2d_counts(counts_x=c1, counts_y=c2, bins=bins,
+                                               range=[x_range, y_range], number_of_decimals=6)
+
+            return lxhe.histogram2d(x=v1, y=v2, bins=bins, range=[x_range, y_range])
 
         fig = plt.figure(num=None, figsize=(self.volt_fig_width, self.volt_fig_height),
                          facecolor='w', edgecolor='k')
 
-        x_range = [0.9 * np.nanmin(v1), 1.1 * np.nanmax(v1)]
-        y_range = [0.9 * np.nanmin(v2), 1.1 * np.nanmax(v2)]
-
         gs = gridspec.GridSpec(1, 1, height_ratios=[1], width_ratios=[1])
         axs1 = fig.add_subplot(gs[0, 0], aspect=1)
-        _, _, _, im = axs1.hist2d(v1, v2, bins=bins, cmap='Spectral', norm=norm,
-                                  range=[x_range, y_range], cmin=cmin, density=density)
+
+        # The counts only depend on the data, the bins and the filters, so they are only computed
+        # again if one of these changes
+        key = None
+        if self.data_version is not None:
+            key = ("hist_plots_volt", self.data_version, t_start, t_end, self.channel1,
+                   self.channel2, bins, v_min, v_max)
+        histogram = hist_cache.get(key=key)
+        if histogram is None:
+            histogram = get_histogram()
+            hist_cache.put(key=key, value=histogram)
+
+        # Same as "hist2d": hide the bins below cmin and fit the axes to the bins. "cmax" is only
+        # the top of the colour scale, the bins above it are still drawn
+        _, _, _, im = lxhe.draw_hist2d(axs=axs1, counts=histogram[0], xedges=histogram[1],
+                                       yedges=histogram[2], density=density, cmin=cmin,
+                                       cmap='Spectral', norm=norm)
         divider1 = make_axes_locatable(axs1)
         cax1 = divider1.append_axes("top", size="5%", pad=0.01)
         cbar1 = plt.colorbar(im, cax=cax1, orientation='horizontal', ticks=None, fraction=0.05,
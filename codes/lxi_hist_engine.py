@@ -0,0 +1,323 @@
+import importlib
+
+import numpy as np
+
+import lxi_memory_cache as lxmc
+
+importlib.reload(lxmc)
+
+
+def bin_index(values=None, edges=None):
+    """
+    Finds the bin of each value for bins of equal width, the same way as "numpy.histogram": each
+    bin has its left edge, and the last one also has its right edge. The bin is computed with a
+    multiplication and then corrected with the edges, so it does not need a search of the edges.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The values. Default is None.
+    edges : numpy.ndarray
+        The edges of the bins, from "numpy.linspace". Default is None.
+
+    Returns
+    -------
+    index : numpy.ndarray
+        The bin of each value, or -1 if the value is outside of the bins or NaN.
+    """
+    n_bins = len(edges) - 1
+    values = np.asarray(values, dtype=float)
+    is_inside = (values >= edges[0]) & (values <= edges[-1])
+
+    index = np.full(len(values), -1, dtype=np.intp)
+    values = values[is_inside]
+    inside_index = ((values - edges[0]) * (n_bins / (edges[-1] - edges[0]))).astype(np.intp)
+    np.clip(inside_index, 0, n_bins - 1, out=inside_index)
+
+    # Correct the bins which are off by one because of the rounding of the multiplication
+    inside_index[values < edges[inside_index]] -= 1
+    inside_index[(values >= edges[inside_index + 1]) & (inside_index < n_bins - 1)] += 1
+    index[is_inside] = inside_index
+
+    return index
+
+
+def histogram2d(x=None, y=None, bins=None, range=None, chunk_size=2 ** 20):
+    """
+    Computes the 2-D histogram of "x" and "y" with bins of equal width. The counts are the same as
+    the ones of "numpy.histogram2d" without density, but the values are binned with "bin_index" and
+    counted with "numpy.bincount", one chunk at a time.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        The values along the x-axis. Default is None.
+    y : numpy.ndarray
+        The values along the y-axis. Default is None.
+    bins : int
+        Number of bins along each axis. Default is None.
+    range : list
+        The range of the bins along each axis, "[[x_min, x_max], [y_min, y_max]]". Default is
+        None.
+    chunk_size : int
+        Number of values binned in one go. Default is 2 ** 20.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        The number of values in each bin (int64), with the x-axis along the first dimension.
+    xedges : numpy.ndarray
+        The edges of the bins along the x-axis.
+    yedges : numpy.ndarray
+        The edges of the bins along the y-axis.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    (x_min, x_max), (y_min, y_max) = range
+    if not (x_min < x_max and y_min < y_max):
+        # Let numpy deal with the ranges of zero width, or raise the error for the invalid ones
+        counts, xedges, yedges = np.histogram2d(x, y, bins=bins, range=range)
+        return counts.astype(np.int64), xedges, yedges
+
+    xedges = np.linspace(x_min, x_max, bins + 1)
+    yedges = np.linspace(y_min, y_max, bins + 1)
+
+    counts = np.zeros(bins * bins, dtype=np.int64)
+    # "range" is the range of the bins here, so the chunks are stepped with "numpy.arange"
+    for ii in np.arange(0, len(x), chunk_size):
+        x_index = bin_index(values=x[ii:ii + chunk_size], edges=xedges)
+        y_index = bin_index(values=y[ii:ii + chunk_size], edges=yedges)
+        is_inside = (x_index >= 0) & (y_index >= 0)
+        counts += np.bincount(x_index[is_inside] * bins + y_index[is_inside],
+                              minlength=bins * bins)
+
+    return counts.reshape(bins, bins), xedges, yedges
+
+
+def draw_hist2d(axs=None, counts=None, xedges=None, yedges=None, density=None, cmin=None,
+                cmax=None, **kwargs):
+    """
+    Draws a 2-D histogram computed beforehand, the same way as "matplotlib.axes.Axes.hist2d" would
+    draw it from the data: the counts are normalized if "density" is True, the bins outside of
+    ["cmin", "cmax"] are not drawn, and the limits of the axes are set to the edges of the bins.
+
+    Parameters
+    ----------
+    axs : matplotlib.axes.Axes
+        The axes. Default is None.
+    counts : numpy.ndarray
+        The counts of the histogram, with the x-axis along the first dimension. They are not
+        changed. Default is None.
+    xedges : numpy.ndarray
+        The edges of the bins along the x-axis. Default is None.
+    yedges : numpy.ndarray
+        The edges of the bins along the y-axis. Default is None.
+    density : bool
+        Whether to draw the density instead of the counts, as in "numpy.histogram2d". Default is
+        None.
+    cmin : float
+        The bins with a value below "cmin" are not drawn. Default is None.
+    cmax : float
+        The bins with a value above "cmax" are not drawn. Default is None.
+    **kwargs :
+        Passed to "matplotlib.axes.Axes.pcolormesh", for example "cmap" and "norm".
+
+    Returns
+    -------
+    h : numpy.ndarray
+        The drawn values, with NaN in the bins which are not drawn.
+    xedges : numpy.ndarray
+        The edges of the bins along the x-axis.
+    yedges : numpy.ndarray
+        The edges of the bins along the y-axis.
+    image : matplotlib.collections.QuadMesh
+        The drawn histogram.
+    """
+    h = counts.astype(float)
+    if density:
+        # In the same order as "numpy.histogram2d", so that the values are the same
+        total = h.sum()
+        h = h / np.diff(xedges)[:, np.newaxis] / np.diff(yedges)[np.newaxis, :]
+        h /= total
+    if cmin is not None:
+        h[h < cmin] = None
+    if cmax is not None:
+        h[h > cmax] = None
+
+    image = axs.pcolormesh(xedges, yedges, h.T, **kwargs)
+    axs.set_xlim(xedges[0], xedges[-1])
+    axs.set_ylim(yedges[0], yedges[-1])
+
+    return h, xedges, yedges, image
+
+
+class hist_engine(lxmc.memory_cache):
+    """
+    Class for caching the counts of the 2-D histograms of the plots, so that a plot can be drawn
+    again with a different colour scale, density or fit without binning the data again.
+
+    Each histogram is saved with "put" under a key which must have everything the counts depend
+    on: the version of the data (see "lxi_data_store.data_store.version"), the number of bins, the
+    ranges and the filters applied to the data. Once there are more than "max_entries" histograms,
+    the one which was used the longest time ago is deleted. The cache can also keep other results
+    computed from the data, such as a "hist_cube".
+
+    Attributes:
+        max_entries: int
+            Maximum number of histograms in the cache. Default is 32.
+        entries: collections.OrderedDict
+            The counts and the edges of the bins of each histogram, from the least to the most
+            recently used.
+    """
+
+    def histogram2d(self, key=None, get_data=None, bins=None, range=None):
+        """
+        Gets the 2-D histogram of the data from the cache, or computes it with "histogram2d" and
+        adds it to the cache.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the histogram. If None, the histogram is computed and not cached. Default
+            is None.
+        get_data : callable
+            Function which returns the x and y values to be binned. It is only called if the
+            histogram is not in the cache. Default is None.
+        bins : int
+            Number of bins along each axis. Default is None.
+        range : list
+            The range of the bins along each axis. Default is None.
+
+        Returns
+        -------
+        counts : numpy.ndarray
+            The number of values in each bin.
+        xedges : numpy.ndarray
+            The edges of the bins along the x-axis.
+        yedges : numpy.ndarray
+            The edges of the bins along the y-axis.
+        """
+        histogram = self.get(key=key)
+        if histogram is None:
+            x, y = get_data()
+            histogram = histogram2d(x=x, y=y, bins=bins, range=range)
+            self.put(key=key, value=histogram)
+
+        return histogram
+
+
+class hist_cube():
+    """
+    Class for the time-cumulative 2-D histograms of the data, so that the histogram of any time
+    window can be found without binning the data again. The time is cut in steps of "cadence"
+    seconds, and the cube has the histogram of all the values before the start of each step. The
+    histogram of a window is then the difference of the two slices of the cube at the first and
+    the last step in the window, and only the values in the parts of the steps at the edges of the
+    window are binned. So the histogram is exactly the same as the one from "histogram2d" of the
+    values in the window, but it takes a time which scales with the number of bins instead of with
+    the number of values.
+
+    Attributes:
+        times: numpy.ndarray
+            The sorted times of the values.
+        x: numpy.ndarray
+            The values along the x-axis, in the same order as "times".
+        y: numpy.ndarray
+            The values along the y-axis, in the same order as "times".
+        bins: int
+            Number of bins along each axis.
+        range: list
+            The range of the bins along each axis, "[[x_min, x_max], [y_min, y_max]]".
+        cadence: float
+            The length of the steps of time, in seconds. It is made longer if the cube would be
+            larger than "max_size_mb".
+        t_edges: numpy.ndarray
+            The start time of each step, and the end time of the last one.
+        positions: numpy.ndarray
+            The position in "times" of the first value of each step, and the number of values at
+            the end.
+        cube: numpy.ndarray
+            The number of values before the start of each step in each bin, with the time along the
+            first dimension.
+        xedges: numpy.ndarray
+            The edges of the bins along the x-axis.
+        yedges: numpy.ndarray
+            The edges of the bins along the y-axis.
+    """
+
+    def __init__(self, times=None, x=None, y=None, bins=None, range=None, cadence=60,
+                 max_size_mb=256):
+        times = np.asarray(times, dtype=float)
+        order = np.argsort(times, kind="stable")
+        self.times = times[order]
+        self.x = np.asarray(x)[order]
+        self.y = np.asarray(y)[order]
+        self.bins = bins
+        self.range = range
+
+        # Make the steps longer if there would be too many of them to keep the cube in memory
+        t_min = self.times[0] if len(self.times) > 0 else 0
+        t_max = self.times[-1] if len(self.times) > 0 else 0
+        max_steps = max(int(max_size_mb * 2 ** 20 / (4 * bins * bins)) - 1, 1)
+        self.cadence = max(cadence, (t_max - t_min) / max_steps)
+        n_steps = max(int(np.ceil((t_max - t_min) / self.cadence)), 1)
+        self.t_edges = t_min + self.cadence * np.arange(n_steps + 1)
+
+        _, self.xedges, self.yedges = histogram2d(x=self.x[:0], y=self.y[:0], bins=bins,
+                                                  range=range)
+        x_index = bin_index(values=self.x, edges=self.xedges)
+        y_index = bin_index(values=self.y, edges=self.yedges)
+        step_index = np.searchsorted(self.t_edges, self.times, side="right") - 1
+        np.clip(step_index, 0, n_steps - 1, out=step_index)
+        is_inside = (x_index >= 0) & (y_index >= 0)
+
+        step_counts = np.bincount((step_index[is_inside] * bins + x_index[is_inside]) * bins +
+                                  y_index[is_inside], minlength=n_steps * bins * bins)
+        self.cube = np.zeros((n_steps + 1, bins, bins), dtype=np.int32)
+        np.cumsum(step_counts.reshape(n_steps, bins, bins), axis=0, out=self.cube[1:])
+
+        # The position of the first value of each step, and the number of values at the end
+        self.positions = np.searchsorted(self.times, self.t_edges, side="left")
+        self.positions[-1] = len(self.times)
+
+    def window(self, t_start=None, t_end=None):
+        """
+        Gets the 2-D histogram of the values between "t_start" and "t_end", both included.
+
+        Parameters
+        ----------
+        t_start : float
+            Start time of the window. Default is None, which starts at the first value.
+        t_end : float
+            End time of the window. Default is None, which ends at the last value.
+
+        Returns
+        -------
+        counts : numpy.ndarray
+            The number of values in each bin (int64), with the x-axis along the first dimension.
+        xedges : numpy.ndarray
+            The edges of the bins along the x-axis.
+        yedges : numpy.ndarray
+            The edges of the bins along the y-axis.
+        """
+        i_start = 0 if t_start is None else np.searchsorted(self.times, t_start, side="left")
+        i_end = (len(self.times) if t_end is None else
+                 np.searchsorted(self.times, t_end, side="right"))
+
+        # The first and the last slices of the cube in the window
+        step_start = np.searchsorted(self.positions, i_start, side="left")
+        step_end = np.searchsorted(self.positions, i_end, side="right") - 1
+        if step_start >= step_end:
+            counts, _, _ = histogram2d(x=self.x[i_start:i_end], y=self.y[i_start:i_end],
+                                       bins=self.bins, range=self.range)
+            return counts, self.xedges, self.yedges
+
+        counts = self.cube[step_end].astype(np.int64) - self.cube[step_start]
+
+        # Add the values in the parts of the steps at the edges of the window
+        for ii, jj in [(i_start, self.positions[step_start]), (self.positions[step_end], i_end)]:
+            if jj > ii:
+                counts += histogram2d(x=self.x[ii:jj], y=self.y[ii:jj], bins=self.bins,
+                                      range=self.range)[0]
+
+        return counts, self.xedges, self.yedges
@@ -0,0 +1,426 @@
+import argparse
+import importlib
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+import lxi_file_read_funcs as lxrf
+
+importlib.reload(lxrf)
+
+
+class packet_ring_buffer():
+    """
+    Class for keeping the most recent decoded packets in preallocated arrays of fixed size, one
+    array per field of the packet. Once the buffer is full, each new packet overwrites the oldest
+    one, so the memory used does not grow with the length of the stream.
+
+    Attributes:
+        capacity: int
+            Maximum number of packets in the buffer.
+        columns: dict
+            Dictionary with the field name as key and the preallocated array as value. The fields
+            are the ones of "lxi_file_read_funcs.packet_array".
+        n_total: int
+            Number of packets added to the buffer since it was created.
+    """
+
+    def __init__(self, capacity=2 ** 20):
+        self.capacity = capacity
+        self.columns = {key: np.zeros(capacity, dtype=dtype)
+                        for key, dtype in lxrf.packet_array.dtypes.items()}
+        self.n_total = 0
+
+    def __len__(self):
+        return min(self.n_total, self.capacity)
+
+    def append(self, packets=None):
+        """
+        Adds packets to the buffer, overwriting the oldest ones if the buffer is full.
+
+        Parameters
+        ----------
+        packets : lxi_file_read_funcs.packet_array
+            The packets, as returned by "lxi_file_read_funcs.decode_packets".
+
+        Returns
+        -------
+            None
+        """
+        n_new = len(packets)
+        # If there are more packets than fit in the buffer, only the last ones are kept
+        packets = packets[max(n_new - self.capacity, 0):]
+        start = (self.n_total + n_new - len(packets)) % self.capacity
+        n_end = min(len(packets), self.capacity - start)
+
+        for key, column in self.columns.items():
+            column[start:start + n_end] = getattr(packets, key)[:n_end]
+            column[:len(packets) - n_end] = getattr(packets, key)[n_end:]
+
+        self.n_total += n_new
+
+    def get(self, n_packets=None):
+        """
+        Gets the most recent packets of the buffer, from the oldest to the newest.
+
+        Parameters
+        ----------
+        n_packets : int
+            Number of packets. Default is None, which returns all the packets in the buffer.
+
+        Returns
+        -------
+        packets : lxi_file_read_funcs.packet_array
+            A copy of the last "n_packets" packets.
+        """
+        if n_packets is None or n_packets > len(self):
+            n_packets = len(self)
+        end = self.n_total % self.capacity
+        index = np.arange(end - n_packets, end) % self.capacity
+
+        return lxrf.packet_array(**{key: column[index] for key, column in self.columns.items()})
+
+    def get_last_seconds(self, n_seconds=None):
+        """
+        Gets the packets of the last "n_seconds" seconds, based on the timestamp of the newest
+        packet.
+
+        Parameters
+        ----------
+        n_seconds : float
+            Length of the time window in seconds. Default is None, which returns all the packets in
+            the buffer.
+
+        Returns
+        -------
+        packets : lxi_file_read_funcs.packet_array
+            The packets in the time window.
+        """
+        packets = self.get()
+        if n_seconds is None or len(self) == 0:
+            return packets
+
+        time_stamp = packets.time_stamp / 1e3
+        in_window = time_stamp >= time_stamp[-1] - n_seconds
+
+        return packets[in_window]
+
+
+class live_ingest():
+    """
+    Class for decoding a live stream of raw packets into two ring buffers, one for the science and
+    one for the housekeeping packets. The stream can arrive in pieces of any size, the partial
+    packet at the end of a piece is decoded with the next one, except for the UDP datagrams, which
+    only have whole packets and are decoded on their own.
+
+    Attributes:
+        lxi_unit: int
+            The LEXI unit which sends the data, used to calibrate the housekeeping values.
+        decoder: lxi_file_read_funcs.packet_stream_decoder
+            Decoder of the stream.
+        sci_buffer: packet_ring_buffer
+            Buffer of the science packets.
+        hk_buffer: packet_ring_buffer
+            Buffer of the housekeeping packets.
+        lock: threading.Lock
+            Lock shared by the thread reading the stream and the ones reading the buffers.
+        n_bytes: int
+            Number of bytes received.
+    """
+
+    def __init__(self, lxi_unit=1, sci_capacity=2 ** 20, hk_capacity=2 ** 16):
+        self.lxi_unit = lxi_unit
+        self.decoder = lxrf.packet_stream_decoder()
+        self.sci_buffer = packet_ring_buffer(capacity=sci_capacity)
+        self.hk_buffer = packet_ring_buffer(capacity=hk_capacity)
+        self.lock = threading.Lock()
+        self.n_bytes = 0
+
+    def feed(self, data=None, whole_packets=False):
+        """
+        Decodes the next piece of the stream and adds the packets to the buffers.
+
+        Parameters
+        ----------
+        data : bytes
+            The next piece of the stream.
+        whole_packets : bool
+            Whether the piece only has whole packets, for example a UDP datagram. It is then
+            decoded on its own, without the bytes carried over by "decoder", and the bytes left
+            after its last packet are dropped instead of being decoded with the next piece.
+            Default is False.
+
+        Returns
+        -------
+            None
+        """
+        if whole_packets:
+            # "find_packet_index" only finds a packet if there is at least one byte after it, like
+            # the search in a file, so a byte is added after the last packet of the piece. A
+            # partial packet at the end of the piece is still not found
+            raw = bytes(data) + b"\x00"
+            packets = lxrf.gather_packets(raw=raw, packet_index=lxrf.find_packet_index(raw))
+        else:
+            packets = self.decoder.feed(data)
+        sci_packets, hk_packets = lxrf.split_packets(packets)
+        with self.lock:
+            self.sci_buffer.append(sci_packets)
+            self.hk_buffer.append(hk_packets)
+            self.n_bytes += len(data)
+
+    def get_data(self, n_seconds=None, number_of_decimals=6):
+        """
+        Gets the science and housekeeping dataframes of the last "n_seconds" seconds, in the same
+        format as the ones from "lxi_file_read_funcs.read_binary_file".
+
+        Parameters
+        ----------
+        n_seconds : float
+            Length of the time window in seconds. Default is None, which uses all the packets in
+            the buffers.
+        number_of_decimals : int
+            Number of decimals of the voltages. Default is 6.
+
+        Returns
+        -------
+        df_sci : pandas.DataFrame
+            The science data, with "TimeStamp" as the index and with the x and y-coordinates.
+        df_hk : pandas.DataFrame
+            The housekeeping data, with "TimeStamp" as the index.
+        """
+        with self.lock:
+            sci_packets = self.sci_buffer.get_last_seconds(n_seconds=n_seconds)
+            hk_packets = self.hk_buffer.get_last_seconds(n_seconds=n_seconds)
+
+        df_sci, _ = lxrf.process_sci_packets(packets=sci_packets,
+                                             number_of_decimals=number_of_decimals,
+                                             save_file=False)
+        df_hk, _ = lxrf.process_hk_packets(packets=hk_packets,
+                                           number_of_decimals=number_of_decimals, save_file=False,
+                                           lxi_unit=self.lxi_unit)
+
+        df_sci = df_sci.set_index('TimeStamp').sort_index()
+        df_hk = df_hk.set_index('TimeStamp').sort_index()
+
+        df_sci = lxrf.add_positions(df=df_sci)
+        df_hk = lxrf.apply_schema(df=df_hk, schema=lxrf.hk_schema)
+
+        return df_sci, df_hk
+
+    def update_global_data(self, n_seconds=None):
+        """
+        Puts the data of the last "n_seconds" seconds in "global_variables.all_file_details", so
+        that the histogram and the time series tabs plot it.
+
+        Parameters
+        ----------
+        n_seconds : float
+            Length of the time window in seconds. Default is None, which uses all the packets in
+            the buffers.
+
+        Returns
+        -------
+            None
+        """
+        df_sci, df_hk = self.get_data(n_seconds=n_seconds)
+        lxrf.set_loaded_data(file_type="sci", df_all=df_sci)
+        lxrf.set_loaded_data(file_type="hk", df_all=df_hk)
+
+    def read_stream(self, stream=None, block_size=2 ** 16):
+        """
+        Reads a file-like stream, such as a named pipe or the standard input, until it is closed.
+
+        Parameters
+        ----------
+        stream : file-like
+            Stream opened in binary mode, for example "sys.stdin.buffer". Default is None.
+        block_size : int
+            Maximum number of bytes read in one go. Default is 2 ** 16.
+
+        Returns
+        -------
+            None
+        """
+        # "read1" returns as soon as some data is available instead of waiting for a full block
+        read = getattr(stream, "read1", stream.read)
+        while True:
+            data = read(block_size)
+            if not data:
+                break
+            self.feed(data)
+
+    def read_tcp(self, host="localhost", port=None, block_size=2 ** 16):
+        """
+        Connects to a TCP server and reads the stream until the server closes the connection.
+
+        Parameters
+        ----------
+        host : str
+            Host name of the server. Default is "localhost".
+        port : int
+            Port of the server. Default is None.
+        block_size : int
+            Maximum number of bytes read in one go. Default is 2 ** 16.
+
+        Returns
+        -------
+            None
+        """
+        with socket.create_connection((host, port)) as sock:
+            while True:
+                data = sock.recv(block_size)
+                if not data:
+                    break
+                self.feed(data)
+
+    def read_udp(self, host="", port=None, block_size=2 ** 16):
+        """
+        Receives UDP datagrams on a port until the program is stopped. Each datagram has whole
+        packets, so it is decoded on its own, and a lost datagram only loses the packets in it.
+
+        Parameters
+        ----------
+        host : str
+            Address to listen on. Default is "", i.e. all the addresses.
+        port : int
+            Port to listen on. Default is None.
+        block_size : int
+            Maximum size of a datagram. Default is 2 ** 16.
+
+        Returns
+        -------
+            None
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind((host, port))
+            while True:
+                data, _ = sock.recvfrom(block_size)
+                self.feed(data, whole_packets=True)
+
+    def start(self, source=None, **kwargs):
+        """
+        Starts reading a source in a background thread, so that the buffers can be read while the
+        data arrives.
+
+        Parameters
+        ----------
+        source : str
+            One of "tcp", "udp" or "stream". Default is None.
+        **kwargs :
+            Arguments of "read_tcp", "read_udp" or "read_stream".
+
+        Raises
+        ------
+        ValueError :
+            If the source is not one of "tcp", "udp" or "stream".
+
+        Returns
+        -------
+        thread : threading.Thread
+            The thread reading the source.
+        """
+        read_funcs = {"tcp": self.read_tcp, "udp": self.read_udp, "stream": self.read_stream}
+        if source not in read_funcs:
+            raise ValueError(
+                f"The source must be one of {list(read_funcs.keys())}, not {source}."
+            )
+
+        thread = threading.Thread(target=read_funcs[source], kwargs=kwargs, daemon=True)
+        thread.start()
+
+        return thread
+
+
+def serve_file(in_file_name=None, host="localhost", port=None, rate_mb_s=None, chunk_size=4096):
+    """
+    Serves a raw file over TCP to one client, to replay a recorded test as if it was live.
+
+    Parameters
+    ----------
+    in_file_name : str
+        Name of the raw file. Default is None.
+    host : str
+        Address to listen on. Default is "localhost".
+    port : int
+        Port to listen on. Default is None.
+    rate_mb_s : float
+        Rate at which the file is sent, in MB/s. Default is None, which sends it as fast as
+        possible.
+    chunk_size : int
+        Number of bytes sent in one go. Default is 4096.
+
+    Returns
+    -------
+        None
+    """
+    with socket.create_server((host, port)) as server:
+        print(f"\n Serving \x1b[1;32;255m{in_file_name}\x1b[0m on \x1b[1;32;255m{host}:{port}"
+              f"\x1b[0m")
+        connection, address = server.accept()
+        with connection, open(in_file_name, 'rb') as file:
+            t_start = time.perf_counter()
+            n_sent = 0
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                connection.sendall(chunk)
+                n_sent += len(chunk)
+                if rate_mb_s is not None:
+                    # Wait until the time at which "n_sent" bytes are due
+                    t_due = n_sent / (rate_mb_s * 2 ** 20)
+                    time.sleep(max(t_due - (time.perf_counter() - t_start), 0))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decode a live LEXI packet stream, or replay a raw file as a live stream."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = subparsers.add_parser("replay", help="Serve a raw file over TCP.")
+    replay_parser.add_argument("file", help="Raw file to serve.")
+    replay_parser.add_argument("--host", default="localhost", help="Address to listen on.")
+    replay_parser.add_argument("--port", type=int, default=5000, help="Port to listen on.")
+    replay_parser.add_argument("--rate", type=float, default=None,
+                               help="Rate in MB/s. Default is as fast as possible.")
+
+    ingest_parser = subparsers.add_parser("ingest", help="Decode a live stream.")
+    ingest_parser.add_argument("source", choices=["tcp", "udp", "pipe", "stdin"],
+                               help="Where the stream comes from.")
+    ingest_parser.add_argument("--host", default="localhost", help="Host of the TCP server.")
+    ingest_parser.add_argument("--port", type=int, default=5000, help="TCP or UDP port.")
+    ingest_parser.add_argument("--pipe", default=None, help="Path of the named pipe.")
+    ingest_parser.add_argument("--unit", type=int, default=1, choices=[1, 2], help="LEXI unit.")
+    ingest_parser.add_argument("--seconds", type=float, default=10,
+                               help="Length of the time window in the summary.")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        serve_file(in_file_name=args.file, host=args.host, port=args.port, rate_mb_s=args.rate)
+        return
+
+    ingest = live_ingest(lxi_unit=args.unit)
+    if args.source == "tcp":
+        thread = ingest.start(source="tcp", host=args.host, port=args.port)
+    elif args.source == "udp":
+        thread = ingest.start(source="udp", host="", port=args.port)
+    elif args.source == "pipe":
+        thread = ingest.start(source="stream", stream=open(args.pipe, 'rb'))
+    else:
+        thread = ingest.start(source="stream", stream=sys.stdin.buffer)
+
+    # Print a summary of the last "seconds" of data every second until the stream ends
+    while thread.is_alive():
+        thread.join(timeout=1)
+        df_sci, df_hk = ingest.get_data(n_seconds=args.seconds)
+        print(f" {ingest.n_bytes / 2 ** 20:.2f} MB received, \x1b[1;32;255m{len(df_sci)}\x1b[0m "
+              f"science and \x1b[1;32;255m{len(df_hk)}\x1b[0m housekeeping packets in the last "
+              f"{args.seconds} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -67,7 +67,8 @@ def load_hist_plots(root=None, df_slice_sci=None, start_time=None, end_time=None
                     cmin=None, cmax=None, x_min=None, x_max=None, y_min=None, y_max=None,
                     density=None, norm=None, row=3, column=1, fig_width=5, fig_height=5,
                     columnspan=2, rowspan=2, v_min=2.2, v_max=3.9, v_sum_min=3, v_sum_max=12,
-                    crv_fit=False, use_fig_size=False):
+                    crv_fit=False, use_fig_size=False, data_version=None,
+                    hist_cube_cadence=None):
     """
     Loads the histogram plots for the selected time range and displays them in the GUI.
 
@@ -109,6 +110,12 @@ def load_hist_plots(root=None, df_slice_sci=None, start_time=None, end_time=None
         The number of columns the plots should span.
     rowspan : int
         The number of rows the plots should span.
+    data_version : int
+        Version of the loaded science data, used to cache the histogram. Default is None, which
+        does not cache it.
+    hist_cube_cadence : float
+        Step of time of the time-cumulative histograms used for the histogram, in seconds. Default
+        is None, which does not use them.
 
     Returns
     -------
@@ -125,7 +132,9 @@ def load_hist_plots(root=None, df_slice_sci=None, start_time=None, end_time=None
                                     density=density, norm=norm, hist_fig_height=fig_height,
                                     hist_fig_width=fig_width, v_min=v_min, v_max=v_max,
                                     v_sum_min=v_sum_min, v_sum_max=v_sum_max, crv_fit=crv_fit,
-                                    use_fig_size=use_fig_size).hist_plots()
+                                    use_fig_size=use_fig_size,
+                                    data_version=data_version,
+                                    hist_cube_cadence=hist_cube_cadence).hist_plots()
     frame = tk.Frame(root)
     frame.grid(row=row, column=column, columnspan=columnspan, rowspan=rowspan, sticky='nsew')
     canvas = FigureCanvasTkAgg(fig_hist, master=frame)
@@ -136,7 +145,8 @@ def load_hist_plots(root=None, df_slice_sci=None, start_time=None, end_time=None
 def load_hist_plots_volt(root=None, df_slice_sci=None, start_time=None, end_time=None, bins=None,
                          cmin=None, cmax=None, density=None, norm=None, channel1=None,
                          channel2=None, row=None, column=None, sticky=None, columnspan=None,
-                         rowspan=None, fig_width=None, fig_height=None, v_min=2.2, v_max=3.9):
+                         rowspan=None, fig_width=None, fig_height=None, v_min=2.2, v_max=3.9,
+                         data_version=None):
     """
     Loads the histogram plots for the selected time range and displays them in the GUI. This is for
     the voltage
@@ -167,6 +177,9 @@ def load_hist_plots_volt(root=None, df_slice_sci=None, start_time=None, end_time
         The width of the figure.
     fig_height : float
         The height of the figure.
+    data_version : int
+        Version of the loaded science data, used to cache the histogram. Default is None, which
+        does not cache it.
 
     Returns
     -------
@@ -180,7 +193,8 @@ def load_hist_plots_volt(root=None, df_slice_sci=None, start_time=None, end_time
     fig_hist = lgpr.plot_data_class(
         df_slice_sci=df_slice_sci, start_time=start_time, end_time=end_time, bins=bins, cmin=cmin,
         cmax=cmax, density=density, norm=norm, channel1=channel1, channel2=channel2,
-        volt_fig_width=fig_width, volt_fig_height=fig_height, v_min=v_min, v_max=v_max
+        volt_fig_width=fig_width, volt_fig_height=fig_height, v_min=v_min, v_max=v_max,
+        data_version=data_version
     ).hist_plots_volt()
     fig_hist.tight_layout()
     frame = tk.Frame(root)
@@ -200,7 +214,8 @@ def load_all_hist_plots(
         column_span_channel24=None, hist_fig_height=None, hist_fig_width=None, hist_colspan=None,
         hist_rowspan=None, channel13_fig_height=None, channel13_fig_width=None,
         channel24_fig_height=None, channel24_fig_width=None, v_min=None, v_max=None,
-        v_sum_min=None, v_sum_max=None, crv_fit=None, use_fig_size=False
+        v_sum_min=None, v_sum_max=None, crv_fit=None, use_fig_size=False, data_version=None,
+        hist_cube_cadence=None
 ):
     """
     Loads the histogram plots for the selected time range and displays them in the GUI. This is for
@@ -270,6 +285,12 @@ def load_all_hist_plots(
         The height of the histogram figure for the channel 2 and 4.
     channel24_fig_width : float
         The width of the histogram figure for the channel 2 and 4.
+    data_version : int
+        Version of the loaded science data, used to cache the histograms. Default is None, which
+        does not cache them.
+    hist_cube_cadence : float
+        Step of time of the time-cumulative histograms used for the main histogram, in seconds.
+        Default is None, which does not use them.
 
     Returns
     -------
@@ -281,7 +302,8 @@ def load_all_hist_plots(
                     column=col_hist, fig_height=hist_fig_height, fig_width=hist_fig_width,
                     columnspan=hist_colspan, rowspan=hist_rowspan, v_min=v_min, v_max=v_max,
                     v_sum_min=v_sum_min, v_sum_max=v_sum_max, crv_fit=crv_fit,
-                    use_fig_size=use_fig_size)
+                    use_fig_size=use_fig_size, data_version=data_version,
+                    hist_cube_cadence=hist_cube_cadence)
 
     load_hist_plots_volt(root=root[1], df_slice_sci=df_slice_sci, start_time=start_time,
                          end_time=end_time, bins=bins, cmin=cmin, cmax=cmax, density=density,
@@ -289,7 +311,7 @@ def load_all_hist_plots(
                          row=row_channel13, column=column_channel13, sticky=sticky_channel13,
                          rowspan=row_span_channel13, columnspan=column_span_channel13,
                          fig_width=channel13_fig_width, fig_height=channel13_fig_height,
-                         v_min=v_min, v_max=v_max)
+                         v_min=v_min, v_max=v_max, data_version=data_version)
 
     load_hist_plots_volt(root=root[1], df_slice_sci=df_slice_sci, start_time=start_time,
                          end_time=end_time, bins=bins, cmin=cmin, cmax=cmax, density=density,
@@ -297,4 +319,4 @@ def load_all_hist_plots(
                          column=column_channel24, sticky=sticky_channel24,
                          rowspan=row_span_channel24, columnspan=column_span_channel24,
                          fig_width=channel24_fig_width, fig_height=channel24_fig_height,
-                         v_min=v_min, v_max=v_max)
+                         v_min=v_min, v_max=v_max, data_version=data_version)
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+
+class memory_cache():
+    """
+    Class for keeping results computed from the data in memory, so that they are not computed
+    again. Each value is saved under a key which must have everything the value depends on, for
+    example the version of the data (see "lxi_data_store.data_store.version"). Once there are more
+    than "max_entries" values, the one which was used the longest time ago is deleted.
+
+    Attributes:
+        max_entries: int
+            Maximum number of values in the cache. Default is 32.
+        entries: collections.OrderedDict
+            The values, from the least to the most recently used.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def get(self, key=None):
+        """
+        Gets a value from the cache.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the value. Default is None.
+
+        Returns
+        -------
+        value : object
+            The value, or None if it is not in the cache or "key" is None.
+        """
+        if key is None or key not in self.entries:
+            return None
+
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key=None, value=None):
+        """
+        Adds a value to the cache, and deletes the least recently used one if there are too many.
+        Nothing is added if "key" is None.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the value. Default is None.
+        value : object
+            The value. Default is None.
+
+        Returns
+        -------
+            None
+        """
+        if key is None:
+            return
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Deletes all the values of the cache.
+
+        Returns
+        -------
+            None
+        """
+        self.entries.clear()
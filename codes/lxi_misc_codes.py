@@ -267,3 +267,85 @@ def hk_value_comp(ii=None, vpc=None, hk_value=None, hk_id=None, lxi_unit=None):
     }
     chosen_func = ops.get(str(hk_id))
     return chosen_func(vpc, hk_value, lxi_unit)
+
+
+# Calibration of the housekeeping values, for each LEXI unit and each "hk_id". Each entry is
+# (use_vpc, offset, scale, divisor) and the calibrated value is computed as
+#     ((hk_value * vpc) + offset) * scale / divisor     if use_vpc is True
+#     (hk_value + offset) * scale / divisor             if use_vpc is False
+# which gives the same values as the functions above (e.g. "V_Imon_5_2_func").
+hk_calibration_table = {
+    1: [
+        (True, -2.73, 100, 1),        # 0: PinPullerTemp
+        (True, -2.73, 100, 1),        # 1: OpticsTemp
+        (True, -2.73, 100, 1),        # 2: LEXIbaseTemp
+        (True, -2.73, 100, 1),        # 3: HVsupplyTemp
+        (True, 0, 1e3, 18),           # 4: +5.2V_Imon
+        (True, 0, 1, 1),              # 5: +10V_Imon
+        (True, 0.0178, 1e3, 9.131),   # 6: +3.3V_Imon
+        (True, 0, 1, 1),              # 7: AnodeVoltMon
+        (True, 0.00747, 1e3, 17.94),  # 8: +28V_Imon
+        (True, 0, 1, 1),              # 9: ADC_Ground
+        (True, 0, 1, 1),              # 10: Cmd_count
+        (False, 0, 1, 1),             # 11: Pinpuller_Armed
+        (False, 0, 1, 1),             # 12: Unused1
+        (False, 0, 1, 1),             # 13: Unused2
+        (True, 0, 1, 1),              # 14: HVmcpAuto
+        (True, 0, 1, 1),              # 15: HVmcpMan
+    ],
+    2: [
+        (True, -2.73, 100, 1),        # 0: PinPullerTemp
+        (True, -2.73, 100, 1),        # 1: OpticsTemp
+        (True, -2.73, 100, 1),        # 2: LEXIbaseTemp
+        (True, -2.73, 100, 1),        # 3: HVsupplyTemp
+        (True, -1.129, 1e3, 21.456),  # 4: +5.2V_Imon
+        (True, 0, 1, 1),              # 5: +10V_Imon
+        (True, -0.029, 1e3, 18),      # 6: +3.3V_Imon
+        (True, 0, 1, 1),              # 7: AnodeVoltMon
+        (True, 0.00747, 1e3, 17.94),  # 8: +28V_Imon
+        (True, 0, 1, 1),              # 9: ADC_Ground
+        (True, 0, 1, 1),              # 10: Cmd_count
+        (False, 0, 1, 1),             # 11: Pinpuller_Armed
+        (False, 0, 1, 1),             # 12: Unused1
+        (False, 0, 1, 1),             # 13: Unused2
+        (True, 0, 1, 1),              # 14: HVmcpAuto
+        (True, 0, 1, 1),              # 15: HVmcpMan
+    ],
+}
+
+
+def hk_value_comp_vec(vpc=None, hk_value=None, hk_id=None, lxi_unit=None):
+    """
+    Computes the calibrated housekeeping values for all the packets at once, using
+    "hk_calibration_table".
+
+    Parameters
+    ----------
+    vpc : float
+        Volts per count of the digitization.
+    hk_value : numpy.ndarray
+        The raw housekeeping values.
+    hk_id : numpy.ndarray
+        The "hk_id" of each value, from 0 to 15.
+    lxi_unit : int
+        The LEXI unit, either 1 or 2.
+
+    Raises
+    ------
+    ValueError:
+        If there is no calibration for "lxi_unit".
+
+    Returns
+    -------
+    hk_value_cal : numpy.ndarray
+        The calibrated housekeeping values.
+    """
+    if lxi_unit not in hk_calibration_table:
+        raise ValueError(f"There is no calibration for the LEXI unit {lxi_unit}.")
+
+    use_vpc, offset, scale, divisor = (np.array(coeff) for coeff in
+                                       zip(*hk_calibration_table[lxi_unit]))
+    gain = np.where(use_vpc, vpc, 1.0)
+    hk_id = np.asarray(hk_id, dtype=np.intp)
+
+    return (hk_value * gain[hk_id] + offset[hk_id]) * scale[hk_id] / divisor[hk_id]
@@ -0,0 +1,149 @@
+import importlib
+
+import numpy as np
+
+import lxi_file_read_funcs as lxrf
+import lxi_memory_cache as lxmc
+
+importlib.reload(lxrf)
+importlib.reload(lxmc)
+
+
+def pack_mask(mask=None):
+    """
+    Packs a boolean mask into bits, so that it takes 8 times less memory.
+
+    Parameters
+    ----------
+    mask : numpy.ndarray
+        The boolean mask. Default is None.
+
+    Returns
+    -------
+    packed_mask : tuple
+        The packed bits of the mask and its length.
+    """
+    return np.packbits(mask), len(mask)
+
+
+def unpack_mask(packed_mask=None):
+    """
+    Unpacks a boolean mask packed by "pack_mask".
+
+    Parameters
+    ----------
+    packed_mask : tuple
+        The packed bits of the mask and its length. Default is None.
+
+    Returns
+    -------
+    mask : numpy.ndarray
+        The boolean mask.
+    """
+    bits, n_rows = packed_mask
+    return np.unpackbits(bits, count=n_rows).view(bool)
+
+
+class selection_cache():
+    """
+    Class for caching the rows of the science data selected by the cuts on the voltages of the
+    channels and on the sum of the shifted voltages, so that the plots which use the same cuts do
+    not apply them to the data again.
+
+    A selection keeps the first row of each time, and the rows which pass the cuts. It is kept as a
+    bit-packed mask of the rows of the dataframe under a key made of the key of the data, for
+    example its name and version (see "lxi_data_store.data_store.version"), and of the cuts. The
+    selections build on each other: the one with the cuts on the sum of the shifted voltages is
+    found from the one with only the cuts on the voltages, which is then also used by the plots of
+    the voltages. The sum of the shifted voltages is computed once per data.
+
+    A dataframe given with the key of the data can have only some of its rows, for example the rows
+    which passed the cuts. So each entry also keeps the index of the dataframe it was computed
+    from, and it is only used for a dataframe which has this same index object.
+
+    Attributes:
+        entries: lxi_memory_cache.memory_cache
+            The index of the dataframe, with the packed mask or the sum of the shifted voltages, of
+            each entry, from the least to the most recently used.
+    """
+
+    def __init__(self, max_entries=16):
+        self.entries = lxmc.memory_cache(max_entries=max_entries)
+
+    def v_sum(self, df=None, data_key=None):
+        """
+        Gets the sum of the shifted voltages of the four channels.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The science dataframe. Default is None.
+        data_key : tuple
+            The key of the data, which must change if the data changes. If None, nothing is cached.
+            Default is None.
+
+        Returns
+        -------
+        v_sum : numpy.ndarray
+            The sum of the shifted voltages of each row.
+        """
+        key = None if data_key is None else (data_key, "v_sum")
+        entry = self.entries.get(key=key)
+        if entry is not None and entry[0] is df.index:
+            return entry[1]
+
+        v_sum = (df["v1_shift"] + df["v2_shift"] + df["v3_shift"] + df["v4_shift"]).to_numpy()
+        self.entries.put(key=key, value=(df.index, v_sum))
+
+        return v_sum
+
+    def mask(self, df=None, data_key=None, v_min=None, v_max=None, v_sum_min=None,
+             v_sum_max=None):
+        """
+        Gets the mask of the rows of the science data which are the first row of their time and
+        pass the cuts. A cut is only applied if both of its limits are given.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The science dataframe. Default is None.
+        data_key : tuple
+            The key of the data, which must change if the data changes. If None, nothing is cached.
+            Default is None.
+        v_min : float
+            Minimum voltage of each channel. Default is None.
+        v_max : float
+            Maximum voltage of each channel. Default is None.
+        v_sum_min : float
+            Minimum sum of the shifted voltages. Default is None.
+        v_sum_max : float
+            Maximum sum of the shifted voltages. Default is None.
+
+        Returns
+        -------
+        mask : numpy.ndarray
+            Whether each row of the dataframe is selected.
+        """
+        key = None if data_key is None else (data_key, "mask", v_min, v_max, v_sum_min,
+                                             v_sum_max)
+        entry = self.entries.get(key=key)
+        if entry is not None and entry[0] is df.index:
+            return unpack_mask(packed_mask=entry[1])
+
+        if v_sum_min is not None and v_sum_max is not None:
+            v_sum = self.v_sum(df=df, data_key=data_key)
+            mask = (self.mask(df=df, data_key=data_key, v_min=v_min, v_max=v_max) &
+                    (v_sum >= v_sum_min) & (v_sum <= v_sum_max))
+        elif v_min is not None and v_max is not None:
+            mask = self.mask(df=df, data_key=data_key)
+            # The voltages are computed from the ADC counts if the dataframe only has the counts
+            for channel in ["Channel1", "Channel2", "Channel3", "Channel4"]:
+                volts = np.asarray(lxrf.channel_volts(df, channel))
+                mask &= (volts >= v_min) & (volts <= v_max)
+        else:
+            # Remove rows with duplicate indices
+            mask = ~df.index.duplicated(keep='first')
+
+        self.entries.put(key=key, value=(df.index, pack_mask(mask=mask)))
+
+        return mask